@@ -10,7 +10,8 @@ groq Python SDK — same multi-agent logic, zero OpenAI dependency.
 
 import os
 import time
-from groq import Groq
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from groq import Groq, RateLimitError
 
 
 # ── Dummy env var to silence any CrewAI/LangChain OpenAI checks ─────────────
@@ -67,6 +68,41 @@ ensure consistent tone, and make every word count.
 Return the COMPLETE polished blog post — do not summarize or shorten it.""",
 }
 
+AGENT_ORDER = [
+    "Research Analyst",
+    "Content Strategist",
+    "SEO Optimizer",
+    "Blog Writer",
+    "Quality Reviewer",
+]
+
+# Which earlier outputs each agent's prompt reads. Agents whose dependencies
+# are all satisfied run together in the same phase.
+AGENT_DEPENDS_ON = {
+    "Research Analyst":   [],
+    "Content Strategist": ["Research Analyst"],
+    "SEO Optimizer":      ["Research Analyst"],
+    "Blog Writer":        ["Content Strategist", "SEO Optimizer"],
+    "Quality Reviewer":   ["Blog Writer"],
+}
+
+
+def _group_into_phases(depends_on: dict) -> list:
+    """Topologically group agents into phases, keeping AGENT_ORDER within a phase."""
+    done, phases = set(), []
+    remaining = [name for name in AGENT_ORDER if name in depends_on]
+    while remaining:
+        phase = [name for name in remaining if set(depends_on[name]) <= done]
+        if not phase:
+            raise ValueError(f"Circular agent dependencies among: {remaining}")
+        phases.append(phase)
+        done.update(phase)
+        remaining = [name for name in remaining if name not in done]
+    return phases
+
+
+AGENT_PHASES = _group_into_phases(AGENT_DEPENDS_ON)
+
 TONE_INSTRUCTIONS = {
     "Professional":  "Use a formal, authoritative, data-driven tone. Professional vocabulary, logical evidence.",
     "Casual":        "Use a conversational, friendly, relatable tone. Simple language, contractions, warm approach.",
@@ -76,48 +112,59 @@ TONE_INSTRUCTIONS = {
 }
 
 
-def run_agent_pipeline(
-    api_key: str,
-    transcript: str,
-    tone: str,
-    word_count: int,
-    seo_mode: str,
-    progress_callbacks: dict = None,
-) -> dict:
-    """
-    Run the full 5-agent pipeline using Groq directly.
-    Returns dict with blog_content and metadata.
-    """
-    client = Groq(api_key=api_key)
+# ── Long-transcript condensing (opt-in map step before the Research Analyst) ─
+# Off by default: it costs one extra Groq call per chunk, which a free-tier key
+# can't always afford. When on, it is best-effort — if any chunk still fails
+# after its retries, the Research Analyst falls back to the truncated transcript.
 
-    max_tokens_map = {800: 1500, 1500: 2500, 2500: 4000, 4000: 6000}
-    max_tokens = max_tokens_map.get(word_count, 2500)
-    tone_desc = TONE_INSTRUCTIONS.get(tone, TONE_INSTRUCTIONS["Professional"])
+RESEARCH_CHAR_LIMIT = 7000   # transcript characters the Research Analyst sees
+CHUNK_WORDS         = 1200   # words per chunk when condensing long transcripts
+CONDENSE_MAX_CHUNKS = 6      # hard cap on extra Groq calls per generation
+CHUNK_RETRIES       = 3
+CHUNK_RETRY_WAIT    = 20     # seconds, when a 429 carries no usable retry-after
 
-    agent_order = [
-        "Research Analyst",
-        "Content Strategist",
-        "SEO Optimizer",
-        "Blog Writer",
-        "Quality Reviewer",
-    ]
+CHUNK_SYSTEM = """You condense one part of a YouTube video transcript into dense notes.
+Keep every concrete claim, example, number, and name. Drop filler and repetition.
+Return plain bullet points only."""
 
-    results = {}
 
-    for i, agent_name in enumerate(agent_order):
+def _retry_after(error: RateLimitError) -> float:
+    """Seconds the API asked us to wait (per-minute token limits need ~tens of s)."""
+    try:
+        return min(60.0, float(error.response.headers["retry-after"]))
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return CHUNK_RETRY_WAIT
 
-        # ── Notify UI: agent starting ──────────────────────────────────────
-        if progress_callbacks and "on_agent_start" in progress_callbacks:
-            progress_callbacks["on_agent_start"](i, agent_name)
 
-        start_time = time.time()
-        context = "\n\n".join(
-            f"=== {k} Output ===\n{v}" for k, v in results.items()
-        )
+def _summarize_chunk(client: Groq, chunk: str, part: int, total: int, char_budget: int) -> str:
+    """Condense one transcript chunk to at most char_budget characters,
+    waiting out 429s as the API asks."""
+    user_prompt = f"""Condense part {part} of {total} of this transcript into notes of at most {char_budget // 6} words.
+
+Transcript part:
+{chunk}"""
+    for attempt in range(CHUNK_RETRIES):
+        try:
+            notes = _call_groq(client, CHUNK_SYSTEM, user_prompt,
+                               max_tokens=max(64, char_budget // 3), temperature=0.3)
+            return notes[:char_budget]
+        except RateLimitError as e:
+            if attempt == CHUNK_RETRIES - 1:
+                raise
+            time.sleep(_retry_after(e))
 
-        # ── Build task prompt for each agent ──────────────────────────────
-        if agent_name == "Research Analyst":
-            user_prompt = f"""Analyze this YouTube video transcript and extract:
+
+def _build_user_prompt(
+    agent_name: str,
+    results: dict,
+    transcript: str,
+    tone_desc: str,
+    word_count: int,
+    seo_mode: str,
+) -> str:
+    """Build the task prompt for one agent from the outputs it depends on."""
+    if agent_name == "Research Analyst":
+        user_prompt = f"""Analyze this YouTube video transcript and extract:
 1. Main topics (3–5 primary themes)
 2. Key concepts and arguments with supporting evidence
 3. Important points worth highlighting in a blog post
@@ -125,12 +172,12 @@ def run_agent_pipeline(
 5. Any data points, statistics, or examples mentioned
 
 Transcript:
-{transcript[:7000]}
+{transcript[:RESEARCH_CHAR_LIMIT]}
 
 Provide a structured analysis to help create an excellent blog post."""
 
-        elif agent_name == "Content Strategist":
-            user_prompt = f"""Based on this research analysis, create a compelling blog outline for ~{word_count} words.
+    elif agent_name == "Content Strategist":
+        user_prompt = f"""Based on this research analysis, create a compelling blog outline for ~{word_count} words.
 
 Research:
 {results.get('Research Analyst', '')[:3000]}
@@ -145,23 +192,20 @@ Requirements:
 
 Return a complete markdown outline with ## and ### headings."""
 
-        elif agent_name == "SEO Optimizer":
-            seo_extras = ""
-            if seo_mode == "Advanced":
-                seo_extras = """
+    elif agent_name == "SEO Optimizer":
+        seo_extras = ""
+        if seo_mode == "Advanced":
+            seo_extras = """
 4. Secondary Keywords (5–8 related keywords, comma-separated)
 5. Optimized H2/H3 heading suggestions
 6. Keyword density recommendation (%)
 7. Link building opportunities
 8. Schema markup type"""
 
-            user_prompt = f"""Create SEO optimization based on this content:
+        user_prompt = f"""Create SEO optimization based on this content:
 
 Research Summary:
-{results.get('Research Analyst', '')[:2000]}
-
-Blog Outline:
-{results.get('Content Strategist', '')[:1500]}
+{results.get('Research Analyst', '')[:3000]}
 
 Required outputs:
 1. SEO Title (60 chars max, compelling, keyword-rich)
@@ -173,8 +217,8 @@ SEO Title: ...
 Meta Description: ...
 Primary Keyword: ..."""
 
-        elif agent_name == "Blog Writer":
-            user_prompt = f"""Write a complete, publication-ready blog post.
+    elif agent_name == "Blog Writer":
+        user_prompt = f"""Write a complete, publication-ready blog post.
 
 Tone: {tone_desc}
 Target Length: approximately {word_count} words
@@ -203,8 +247,8 @@ Start with these metadata lines at the very top:
 
 Then write the full blog post below."""
 
-        elif agent_name == "Quality Reviewer":
-            user_prompt = f"""Review and polish this blog post to publication standards:
+    elif agent_name == "Quality Reviewer":
+        user_prompt = f"""Review and polish this blog post to publication standards:
 
 {results.get('Blog Writer', '')}
 
@@ -221,10 +265,45 @@ IMPORTANT: Return the COMPLETE polished blog post in Markdown.
 Keep SEO Title, Meta Description, and Primary Keyword at the top.
 Do NOT shorten, summarize, or remove content."""
 
-        else:
-            user_prompt = f"Process the following:\n\n{context}"
+    else:
+        context = "\n\n".join(
+            f"=== {k} Output ===\n{v}" for k, v in results.items()
+        )
+        user_prompt = f"Process the following:\n\n{context}"
+
+    return user_prompt
+
+
+def iter_agent_pipeline(
+    api_key: str,
+    transcript: str,
+    tone: str,
+    word_count: int,
+    seo_mode: str,
+    max_workers: int = 5,
+    condense: bool = False,
+):
+    """
+    Run the 5-agent pipeline and yield progress events as it goes:
+      {"event": "chunk",    "done": k, "total": n}   # condense=True, long transcripts only
+      {"event": "start",    "index": i, "agent": name}
+      {"event": "complete", "index": i, "agent": name, "duration": s, "output": text}
+      {"event": "done",     "result": {...}}   # same dict run_agent_pipeline returns
+    With condense=True, transcripts longer than the Research Analyst's window
+    are first condensed in at most CONDENSE_MAX_CHUNKS parts on up to
+    max_workers threads; otherwise the window truncates them. Agents within the
+    same phase run concurrently; events are always yielded on the consuming thread.
+    """
+    client = Groq(api_key=api_key)
 
-        # ── Call Groq ──────────────────────────────────────────────────────
+    max_tokens_map = {800: 1500, 1500: 2500, 2500: 4000, 4000: 6000}
+    max_tokens = max_tokens_map.get(word_count, 2500)
+    tone_desc = TONE_INSTRUCTIONS.get(tone, TONE_INSTRUCTIONS["Professional"])
+
+    results = {}
+
+    def run_agent(agent_name: str, user_prompt: str):
+        start_time = time.time()
         output = _call_groq(
             client=client,
             system_prompt=AGENT_SYSTEMS[agent_name],
@@ -232,20 +311,99 @@ Do NOT shorten, summarize, or remove content."""
             max_tokens=max_tokens,
             temperature=0.65,
         )
-        results[agent_name] = output
-
-        duration = round(time.time() - start_time, 1)
-
-        # ── Notify UI: agent complete ──────────────────────────────────────
-        if progress_callbacks and "on_agent_complete" in progress_callbacks:
-            progress_callbacks["on_agent_complete"](i, agent_name, duration)
+        return output, round(time.time() - start_time, 1)
+
+    if condense and len(transcript) > RESEARCH_CHAR_LIMIT:
+        words  = transcript.split()
+        size   = max(CHUNK_WORDS, -(-len(words) // CONDENSE_MAX_CHUNKS))
+        chunks = [' '.join(words[i:i + size]) for i in range(0, len(words), size)]
+        total  = len(chunks)
+        # Every part gets an equal share of the window after its "[Part i/n]"
+        # header and separator, so the joined notes always fit whole and the
+        # end of the video is never cut off by the window
+        budget = (RESEARCH_CHAR_LIMIT - total * len(f"[Part {total}/{total}]\n\n\n")) // total
+        notes  = [""] * total
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as chunk_pool:
+                futures = {
+                    chunk_pool.submit(_summarize_chunk, client, chunk, i + 1, total, budget): i
+                    for i, chunk in enumerate(chunks)
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    notes[futures[future]] = future.result()
+                    yield {"event": "chunk", "done": done, "total": total}
+        except Exception:
+            notes = None    # best-effort: keep the truncated transcript instead
+        if notes:
+            transcript = "\n\n".join(f"[Part {i + 1}/{total}]\n{n}" for i, n in enumerate(notes))
+
+    with ThreadPoolExecutor(max_workers=max(len(p) for p in AGENT_PHASES)) as pool:
+        for phase in AGENT_PHASES:
+            # Prompts are built before any agent of the phase runs, so every
+            # agent only sees outputs from earlier phases.
+            prompts = {
+                name: _build_user_prompt(name, results, transcript, tone_desc, word_count, seo_mode)
+                for name in phase
+            }
+
+            futures = {}
+            for agent_name in phase:
+                yield {"event": "start", "index": AGENT_ORDER.index(agent_name), "agent": agent_name}
+                futures[pool.submit(run_agent, agent_name, prompts[agent_name])] = agent_name
+
+            for future in as_completed(futures):
+                agent_name = futures[future]
+                output, duration = future.result()
+                results[agent_name] = output
+                yield {
+                    "event":    "complete",
+                    "index":    AGENT_ORDER.index(agent_name),
+                    "agent":    agent_name,
+                    "duration": duration,
+                    "output":   output,
+                }
 
     final_blog = results.get("Quality Reviewer", results.get("Blog Writer", ""))
 
-    return {
-        "blog_content": final_blog,
-        "research":     results.get("Research Analyst", ""),
-        "outline":      results.get("Content Strategist", ""),
-        "seo":          results.get("SEO Optimizer", ""),
-        "word_count":   len(final_blog.split()),
+    yield {
+        "event": "done",
+        "result": {
+            "blog_content": final_blog,
+            "research":     results.get("Research Analyst", ""),
+            "outline":      results.get("Content Strategist", ""),
+            "seo":          results.get("SEO Optimizer", ""),
+            "word_count":   len(final_blog.split()),
+        },
     }
+
+
+def run_agent_pipeline(
+    api_key: str,
+    transcript: str,
+    tone: str,
+    word_count: int,
+    seo_mode: str,
+    progress_callbacks: dict = None,
+    max_workers: int = 5,
+    condense: bool = False,
+) -> dict:
+    """
+    Run the full 5-agent pipeline using Groq directly, blocking until done.
+    Returns dict with blog_content and metadata.
+    """
+    callbacks = progress_callbacks or {}
+    on_chunk = callbacks.get("on_chunk_complete")
+    on_start = callbacks.get("on_agent_start")
+    on_complete = callbacks.get("on_agent_complete")
+
+    for event in iter_agent_pipeline(api_key, transcript, tone, word_count, seo_mode,
+                                     max_workers, condense):
+        # ── Notify UI: chunk condensed / agent starting / complete ─────────
+        if event["event"] == "chunk" and on_chunk:
+            on_chunk(event["done"], event["total"])
+        elif event["event"] == "start" and on_start:
+            on_start(event["index"], event["agent"])
+        elif event["event"] == "complete" and on_complete:
+            on_complete(event["index"], event["agent"], event["duration"])
+        elif event["event"] == "done":
+            return event["result"]
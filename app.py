@@ -13,10 +13,19 @@ NEW FEATURES v3.0:
 """
 
 import streamlit as st
+import html
+import json
+import queue
+import threading
 import time
 import re
 import os
 import markdown as md
+import streamlit.components.v1 as components
+
+# Script-capable HTML iframe: st.iframe on current Streamlit, components.html
+# (deprecated there) on older releases
+html_iframe = getattr(st, "iframe", None) or components.html
 
 st.set_page_config(
     page_title="DocMind Studio",
@@ -26,7 +35,8 @@ st.set_page_config(
 )
 
 from styles import (
-    FONTS_AND_STYLES,
+    inject_styles,
+    render_html,
     get_stage_bar_html,
     get_agent_card_html,
     get_seo_section_html,
@@ -35,16 +45,14 @@ from utils import (
     validate_youtube_url,
     fetch_transcript,
     chunk_transcript,
-    parse_blog_metadata,
+    parse_and_clean_blog,
     clean_blog_for_display,
     count_words,
     format_word_count,
 )
 
-st.markdown(FONTS_AND_STYLES, unsafe_allow_html=True)
-
 # ── NEW FEATURE CSS ──────────────────────────────────────────────────────────
-st.markdown("""
+FEATURE_CSS = """
 <style>
 /* ── Typewriter animation ── */
 @keyframes typewriter-cursor {
@@ -61,17 +69,20 @@ st.markdown("""
   animation: typewriter-cursor 0.8s ease infinite;
 }
 
-/* ── Floating action bar ── */
-.floating-bar {
+.st-key-confetti_host { display: none; }
+
+/* ── Floating action bar (the keyed st.container "floating_bar") ── */
+.st-key-floating_bar {
   position: fixed;
   top: 64px;
   right: 24px;
   z-index: 9999;
+  width: auto;
   display: flex;
   flex-direction: column;
   gap: 8px;
 }
-.fab-btn {
+.stApp .st-key-floating_bar button {
   background: rgba(26,35,50,0.95);
   border: 1px solid rgba(236,72,153,0.35);
   border-radius: 10px;
@@ -80,16 +91,11 @@ st.markdown("""
   font-family: Inter, sans-serif;
   font-size: 13px;
   font-weight: 500;
-  cursor: pointer;
-  backdrop-filter: blur(12px);
   transition: all 200ms ease;
-  display: flex;
-  align-items: center;
-  gap: 7px;
   white-space: nowrap;
   box-shadow: 0 4px 20px rgba(0,0,0,0.3);
 }
-.fab-btn:hover {
+.stApp .st-key-floating_bar button:hover {
   background: rgba(236,72,153,0.18);
   border-color: #ec4899;
   transform: translateX(-3px);
@@ -190,6 +196,19 @@ st.markdown("""
   overflow-y: auto;
 }
 
+/* ── Blog sections (typewriter view) ── */
+.blog-section {
+  background: #1a2332;
+  border: 1px solid rgba(148,163,184,0.12);
+  border-radius: 16px;
+  padding: 32px 40px;
+  font-family: 'Newsreader', Georgia, serif;
+  font-size: 17px;
+  line-height: 1.8;
+  color: #f1f5f9;
+  animation: slideUp 0.5s ease both;   /* "both": hidden until its delay starts */
+}
+
 /* ── Success celebration ── */
 .success-ring {
   width: 90px; height: 90px;
@@ -200,9 +219,79 @@ st.markdown("""
   justify-content: center;
   font-size: 40px;
   margin: 0 auto 20px;
-  animation: slideUp 0.5s ease, glow-pulse 2s ease infinite;
+  position: relative;
+  animation: slideUp 0.5s ease;
   box-shadow: 0 0 30px rgba(16,185,129,0.4);
 }
+.success-ring::after {
+  content: "";
+  position: absolute;
+  inset: 0;
+  border-radius: inherit;
+  box-shadow: 0 0 40px rgba(16,185,129,0.6);
+  pointer-events: none;
+  animation: glow-pulse 2s ease infinite;
+}
+
+/* ── Output stage ── */
+.success-header {
+  text-align: center;
+  padding: 32px 20px 24px;
+  background: linear-gradient(135deg, rgba(16,185,129,0.08), rgba(6,182,212,0.06));
+  border-radius: 16px;
+  margin-bottom: 24px;
+  border: 1px solid rgba(16,185,129,0.2);
+}
+.success-header-title {
+  font-family: 'Bricolage Grotesque', sans-serif;
+  font-size: 28px;
+  font-weight: 600;
+  color: #f1f5f9;
+  margin-bottom: 6px;
+}
+.success-header-stats {
+  font-family: Inter, sans-serif;
+  font-size: 14px;
+  color: #64748b;
+}
+.success-header-time { color: #10b981; }
+.output-title {
+  font-family: 'Bricolage Grotesque', sans-serif;
+  font-size: 20px;
+  font-weight: 600;
+  color: #f1f5f9;
+  margin-bottom: 4px;
+}
+.grad-hr {
+  border: none;
+  height: 1px;
+  background: linear-gradient(90deg, #ec4899, #a855f7, transparent);
+  margin: 24px 0;
+}
+.split-labels {
+  display: flex;
+  gap: 4px;
+  margin-bottom: 8px;
+}
+.split-label {
+  flex: 1;
+  font-size: 11px;
+  font-weight: 600;
+  letter-spacing: 0.12em;
+  text-transform: uppercase;
+  color: #64748b;
+  padding-left: 4px;
+}
+.export-label {
+  margin-top: 28px;
+  margin-bottom: 12px;
+  font-family: Inter, sans-serif;
+  font-size: 10px;
+  font-weight: 600;
+  letter-spacing: 0.15em;
+  text-transform: uppercase;
+  color: #64748b;
+}
 
 /* ── Progress time bar ── */
 .progress-time-row {
@@ -213,14 +302,16 @@ st.markdown("""
   flex-wrap: wrap;
 }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+inject_styles(FEATURE_CSS)
 
 # ── Confetti JS ──────────────────────────────────────────────────────────────
 CONFETTI_JS = """
-<canvas id="confetti-canvas"></canvas>
-<script>
 (function(){
-  var canvas = document.getElementById('confetti-canvas');
+  var canvas = document.createElement('canvas');
+  canvas.id = 'confetti-canvas';
+  document.body.appendChild(canvas);
   var ctx = canvas.getContext('2d');
   canvas.width = window.innerWidth;
   canvas.height = window.innerHeight;
@@ -244,7 +335,7 @@ CONFETTI_JS = """
 
   var angle = 0;
   var frames = 0;
-  var maxFrames = 200;
+  var maxFrames = window.matchMedia('(prefers-reduced-motion: reduce)').matches ? 0 : 200;
 
   function draw(){
     ctx.clearRect(0, 0, canvas.width, canvas.height);
@@ -267,25 +358,153 @@ CONFETTI_JS = """
       }
     });
     if(frames < maxFrames) requestAnimationFrame(draw);
-    else { ctx.clearRect(0,0,canvas.width,canvas.height); }
+    else canvas.remove();
   }
   draw();
 })();
-</script>
 """
 
+# st.markdown never executes <script>, so the animation goes through an
+# html_iframe. The iframe is same-origin; it hands the script to the
+# parent page, where it draws over the whole viewport and keeps running after
+# the next rerun removes the (zero-height) iframe.
+CONFETTI_HTML = (
+    "<script>var s = window.parent.document.createElement('script');"
+    f"s.textContent = {json.dumps(CONFETTI_JS)};"
+    "window.parent.document.body.appendChild(s);</script>"
+)
+
 # ── API Key ──────────────────────────────────────────────────────────────────
-def get_groq_api_key() -> str:
+def get_setting(name: str, default: str = "") -> str:
     try:
-        key = st.secrets.get("GROQ_API_KEY", "")
-        if key:
-            return key
+        value = st.secrets.get(name, "")
+        if value:
+            return str(value)
     except Exception:
         pass
-    return os.environ.get("GROQ_API_KEY", "")
+    return os.environ.get(name, default)
+
+def get_groq_api_key() -> str:
+    return get_setting("GROQ_API_KEY")
 
 GROQ_API_KEY = get_groq_api_key()
 
+try:
+    GROQ_MAX_WORKERS = max(1, int(get_setting("GROQ_MAX_WORKERS", "5")))
+except ValueError:
+    GROQ_MAX_WORKERS = 5
+
+# Opt-in: condense long transcripts part by part before research (extra Groq calls)
+CONDENSE_LONG_TRANSCRIPTS = get_setting("CONDENSE_LONG_TRANSCRIPTS").strip().lower() in ("1", "true", "yes", "on")
+
+# ── Blog rendering ───────────────────────────────────────────────────────────
+@st.cache_resource
+def _markdown_renderer():
+    """One Markdown converter (extensions loaded once) shared by all sessions.
+    The lock serializes convert(), since Markdown instances are stateful."""
+    return md.Markdown(extensions=['fenced_code', 'tables']), threading.Lock()
+
+def _markdown_to_html(text: str) -> str:
+    renderer, lock = _markdown_renderer()
+    with lock:
+        return renderer.reset().convert(text)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _render_blog(blog: str) -> tuple:
+    """Derive everything the output stage shows from the raw blog markdown.
+    Returns (clean_blog, blog_html, seo_metadata, word_count,
+             seo_title_safe, meta_desc_safe) — the last two HTML-escaped."""
+    meta, clean_blog = parse_and_clean_blog(blog)
+    blog_html = _markdown_to_html(clean_blog)
+    return (
+        clean_blog, blog_html, meta, count_words(blog),
+        html.escape(meta.get("seo_title") or "Blog Post", quote=True),
+        html.escape(meta.get("meta_description", ""), quote=True),
+    )
+
+SECTION_RE = re.compile(r'(?=\n## |\n# )')
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _render_sections(clean_blog: str) -> list:
+    """Split the cleaned blog at H1/H2 headings and render each section to HTML."""
+    sections = SECTION_RE.split(clean_blog)
+    return [
+        _markdown_to_html(sec)
+        for sec in (s.strip() for s in sections) if sec
+    ]
+
+# Static parts of the HTML export — only the title, description and body vary.
+HTML_SHELL_HEAD = b'<!DOCTYPE html>\n<html lang="en"><head><meta charset="UTF-8"><title>'
+HTML_SHELL_META = b'</title>\n<meta name="description" content="'
+HTML_SHELL_BODY = b"""">
+<style>body{max-width:800px;margin:60px auto;font-family:Georgia,serif;
+font-size:18px;line-height:1.8;color:#1a1a1a;padding:0 20px}
+h1{font-size:36px}h2{font-size:28px}h3{font-size:22px}
+pre{background:#f4f4f4;padding:16px;border-radius:8px;overflow-x:auto}
+code{background:#f0f0f0;padding:2px 6px;border-radius:4px}
+blockquote{border-left:3px solid #ec4899;padding:12px 20px;background:#fafafa}
+</style></head><body>"""
+HTML_SHELL_TAIL = b"</body></html>"
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _build_exports(blog: str, clean_blog: str, blog_html: str,
+                   seo_title_safe: str, meta_desc_safe: str) -> dict:
+    """Encode the .md / .txt / .html download payloads once per blog."""
+    return {
+        "md":   blog.encode("utf-8"),
+        "txt":  clean_blog.encode("utf-8"),
+        "html": b"".join((
+            HTML_SHELL_HEAD, seo_title_safe.encode("utf-8"),
+            HTML_SHELL_META, meta_desc_safe.encode("utf-8"),
+            HTML_SHELL_BODY, blog_html.encode("utf-8"),
+            HTML_SHELL_TAIL,
+        )),
+    }
+
+# Floating Copy button. It lives in its own script iframe (the app's CSS doesn't
+# reach in, hence the inline look matching the other floating buttons); the
+# blog is embedded once as a JSON string, so a click copies without any DOM work.
+COPY_BUTTON_HTML = """<button id="copy" style="background:rgba(26,35,50,0.95);
+  border:1px solid rgba(236,72,153,0.35);border-radius:10px;padding:10px 16px;
+  color:#f1f5f9;font:500 13px Inter,sans-serif;cursor:pointer;white-space:nowrap;
+  margin:0;">📋 Copy</button>
+<script>
+var text = $payload, btn = document.getElementById('copy');
+btn.onclick = function(){
+  navigator.clipboard.writeText(text).then(function(){
+    btn.textContent = '✅ Copied!';
+    setTimeout(function(){ btn.textContent = '📋 Copy'; }, 1500);
+  });
+};
+</script>"""
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _copy_button_html(clean_blog: str) -> str:
+    # "</" is escaped so the text can never close the <script> element early
+    payload = json.dumps(clean_blog).replace("</", "<\\/")
+    return COPY_BUTTON_HTML.replace("$payload", payload)
+
+# ── Background pipeline ──────────────────────────────────────────────────────
+def _pump_pipeline(events: queue.Queue, **pipeline_kwargs):
+    """Thread target: run the agent pipeline and post every event onto the bus.
+    The processing stage drains the queue on its own reruns, so no Streamlit
+    call ever happens off the script thread."""
+    try:
+        from agents import iter_agent_pipeline
+        for event in iter_agent_pipeline(**pipeline_kwargs):
+            events.put(event)
+    except Exception as e:
+        events.put({"event": "error", "error": str(e)})
+
+# ── Generation error messages ────────────────────────────────────────────────
+# First entry whose keywords all appear in the lowercased error wins.
+GENERATION_ERRORS = [
+    (("rate",),          "⏱ Rate limit reached. Please wait 60 seconds and try again."),
+    (("429",),           "⏱ Rate limit reached. Please wait 60 seconds and try again."),
+    (("invalid", "api"), "🔑 Invalid API key. Please check your GROQ_API_KEY in secrets.toml."),
+    (("token", "limit"), "📄 Video is too long for the free tier. Try a shorter video (under 30 min)."),
+]
+
 # ── Session state ────────────────────────────────────────────────────────────
 def init_session_state():
     defaults = {
@@ -314,6 +533,10 @@ def init_session_state():
         "split_view": False,
         "show_confetti": False,
         "processing_start": None,
+        "pipeline_events": None,
+        "pipeline_start": None,
+        "chunk_progress": None,
+        "latest_output": None,
     }
     for k, v in defaults.items():
         if k not in st.session_state:
@@ -321,6 +544,29 @@ def init_session_state():
 
 init_session_state()
 
+# ── Sidebar config callback ──────────────────────────────────────────────────
+TONE_OPTIONS = ["Professional", "Casual", "Educational", "Storytelling", "Technical"]
+LENGTH_OPTIONS = {
+    "Short (~800 words)":   800,
+    "Medium (~1500 words)": 1500,
+    "Long (~2500 words)":   2500,
+    "Epic (~4000 words)":   4000,
+}
+
+ETA_SECONDS = {800: 35, 1500: 55, 2500: 90, 4000: 140}
+
+def _update_config():
+    """Copy all customization widgets into session state in one batched write."""
+    length_label = st.session_state.length_field
+    advanced_seo = st.session_state.seo_field
+    st.session_state.update({
+        "tone":              st.session_state.tone_field,
+        "length_label":      length_label,
+        "word_count_target": LENGTH_OPTIONS[length_label],
+        "advanced_seo":      advanced_seo,
+        "seo_mode":          "Advanced" if advanced_seo else "Basic",
+    })
+
 # ── TOP BAR ──────────────────────────────────────────────────────────────────
 api_dot   = "#10b981" if GROQ_API_KEY else "#f43f5e"
 api_label = "API Ready" if GROQ_API_KEY else "No API Key"
@@ -352,130 +598,9 @@ if not GROQ_API_KEY:
 </div>
 """, unsafe_allow_html=True)
 
-# ── SIDEBAR ──────────────────────────────────────────────────────────────────
-with st.sidebar:
-
-    st.markdown(
-        '<p style="font-family:Inter,sans-serif;font-size:10px;font-weight:600;'
-        'letter-spacing:0.15em;text-transform:uppercase;color:#64748b;'
-        'padding:16px 4px 8px;margin:0;">INPUT</p>',
-        unsafe_allow_html=True,
-    )
-
-    url_input = st.text_input(
-        "YouTube URL",
-        value=st.session_state.url,
-        placeholder="youtube.com/watch?v=... or youtu.be/...",
-        help="Supports standard, Shorts, and mobile URLs",
-        key="url_field",
-        label_visibility="collapsed",
-    )
-
-    url_valid = False
-    video_id  = None
-
-    if url_input:
-        st.session_state.url = url_input
-        is_valid, result = validate_youtube_url(url_input)
-        if is_valid:
-            url_valid = True
-            video_id  = result
-            st.session_state.video_id = video_id
-            st.success(f"✓ Valid URL — Video ID: `{video_id}`")
-        elif result:
-            st.error(result)
-
-    st.divider()
-
-    st.markdown(
-        '<p style="font-family:Inter,sans-serif;font-size:10px;font-weight:600;'
-        'letter-spacing:0.15em;text-transform:uppercase;color:#64748b;'
-        'padding:8px 4px;margin:0;">CUSTOMIZATION</p>',
-        unsafe_allow_html=True,
-    )
-
-    tone = st.selectbox(
-        "Writing Tone",
-        ["Professional", "Casual", "Educational", "Storytelling", "Technical"],
-        index=["Professional","Casual","Educational","Storytelling","Technical"].index(
-            st.session_state.tone),
-        help="Sets the voice and style of the generated blog post",
-    )
-    st.session_state.tone = tone
-
-    length_options = {
-        "Short (~800 words)":   800,
-        "Medium (~1500 words)": 1500,
-        "Long (~2500 words)":   2500,
-        "Epic (~4000 words)":   4000,
-    }
-    length_label = st.select_slider(
-        "Content Length",
-        options=list(length_options.keys()),
-        value=st.session_state.length_label,
-    )
-    st.session_state.length_label      = length_label
-    st.session_state.word_count_target = length_options[length_label]
-
-    advanced_seo = st.checkbox(
-        "Advanced SEO Mode",
-        value=st.session_state.advanced_seo,
-        help="Adds secondary keywords, heading suggestions, keyword density & link opportunities",
-    )
-    st.session_state.advanced_seo = advanced_seo
-    st.session_state.seo_mode     = "Advanced" if advanced_seo else "Basic"
-
-    st.divider()
-
-    can_generate = url_valid and bool(GROQ_API_KEY) and st.session_state.stage != "processing"
-
-    # ── FEATURE 6: ETA display under generate button ──────────────────────
-    eta_map = {800: 35, 1500: 55, 2500: 90, 4000: 140}
-    eta_sec = eta_map.get(st.session_state.word_count_target, 55)
-
-    if st.session_state.stage == "processing" and st.session_state.processing_start:
-        elapsed = int(time.time() - st.session_state.processing_start)
-        remaining = max(0, eta_sec - elapsed)
-        st.markdown(f"""
-<div class="progress-time-row">
-  <div class="timer-badge">
-    <span class="timer-dot"></span> {elapsed}s elapsed
-  </div>
-  <div class="eta-badge">⏳ ~{remaining}s remaining</div>
-</div>
-""", unsafe_allow_html=True)
-    else:
-        st.markdown(f"""
-<div style="margin-bottom:8px;">
-  <div class="eta-badge">⏱ Est. ~{eta_sec}s for {length_label.split('(')[0].strip()}</div>
-</div>
-""", unsafe_allow_html=True)
-
-    if st.button(
-        "✨  Generate Blog Post",
-        disabled=not can_generate,
-        use_container_width=True,
-        help=(
-            "Start the 5-agent blog generation pipeline" if can_generate
-            else ("Add GROQ_API_KEY to secrets.toml" if not GROQ_API_KEY
-                  else "Enter a valid YouTube URL first")
-        ),
-    ):
-        st.session_state.stage            = "processing"
-        st.session_state.error            = None
-        st.session_state.blog_content     = ""
-        st.session_state.show_confetti    = False
-        st.session_state.agent_thoughts   = {}
-        st.session_state.processing_start = time.time()
-        for agent in st.session_state.agent_statuses:
-            st.session_state.agent_statuses[agent] = {"status": "pending", "duration": 0}
-        st.rerun()
-
-    if not GROQ_API_KEY:
-        st.caption("🔑 Add GROQ_API_KEY to secrets.toml")
-    elif not url_valid:
-        st.caption("Paste a YouTube URL above to get started")
-
+# ── Sidebar progress ─────────────────────────────────────────────────────────
+def _sidebar_workflow_progress():
+    """WORKFLOW PROGRESS rows and overall bar, drawn from agent_statuses."""
     st.divider()
 
     st.markdown(
@@ -539,6 +664,153 @@ with st.sidebar:
   </div>
 </div>""", unsafe_allow_html=True)
 
+
+@st.fragment(run_every=1.0)
+def _sidebar_live_progress():
+    """While processing, only fragments rerun, so the sidebar's timer and
+    workflow rows tick in their own fragment alongside the main panel's.
+    Once a second is enough here: the timer counts whole seconds, and the
+    rows are a summary of the live cards in the main panel."""
+    eta_sec   = ETA_SECONDS.get(st.session_state.word_count_target, 55)
+    elapsed   = int(time.time() - st.session_state.processing_start) if st.session_state.processing_start else 0
+    remaining = max(0, eta_sec - elapsed)
+    st.markdown(f"""
+<div class="progress-time-row">
+  <div class="timer-badge">
+    <span class="timer-dot"></span> {elapsed}s elapsed
+  </div>
+  <div class="eta-badge">⏳ ~{remaining}s remaining</div>
+</div>
+""", unsafe_allow_html=True)
+    _sidebar_workflow_progress()
+
+
+# ── SIDEBAR ──────────────────────────────────────────────────────────────────
+with st.sidebar:
+    # ── Processing: read-only summary, no widgets to reconcile ────────────
+    if st.session_state.stage == "processing":
+        st.markdown(f"""
+<p style="font-family:Inter,sans-serif;font-size:10px;font-weight:600;
+   letter-spacing:0.15em;text-transform:uppercase;color:#64748b;
+   padding:16px 4px 8px;margin:0;">GENERATING</p>
+<div style="font-family:Inter,sans-serif;font-size:13px;color:#cbd5e1;line-height:1.9;
+     padding:0 4px 12px;word-break:break-all;">
+  <strong style="color:#f1f5f9;">URL:</strong> {html.escape(st.session_state.url)}<br>
+  <strong style="color:#f1f5f9;">Tone:</strong> {st.session_state.tone}<br>
+  <strong style="color:#f1f5f9;">Length:</strong> {st.session_state.length_label}<br>
+  <strong style="color:#f1f5f9;">SEO:</strong> {st.session_state.seo_mode}
+</div>
+""", unsafe_allow_html=True)
+        _sidebar_live_progress()
+
+    else:
+        st.markdown(
+            '<p style="font-family:Inter,sans-serif;font-size:10px;font-weight:600;'
+            'letter-spacing:0.15em;text-transform:uppercase;color:#64748b;'
+            'padding:16px 4px 8px;margin:0;">INPUT</p>',
+            unsafe_allow_html=True,
+        )
+
+        url_input = st.text_input(
+            "YouTube URL",
+            value=st.session_state.url,
+            placeholder="youtube.com/watch?v=... or youtu.be/...",
+            help="Supports standard, Shorts, and mobile URLs",
+            key="url_field",
+            label_visibility="collapsed",
+        )
+
+        url_valid = False
+        video_id  = None
+
+        if url_input:
+            st.session_state.url = url_input
+            is_valid, result = validate_youtube_url(url_input)
+            if is_valid:
+                url_valid = True
+                video_id  = result
+                st.session_state.video_id = video_id
+                st.success(f"✓ Valid URL — Video ID: `{video_id}`")
+            elif result:
+                st.error(result)
+
+        st.divider()
+
+        st.markdown(
+            '<p style="font-family:Inter,sans-serif;font-size:10px;font-weight:600;'
+            'letter-spacing:0.15em;text-transform:uppercase;color:#64748b;'
+            'padding:8px 4px;margin:0;">CUSTOMIZATION</p>',
+            unsafe_allow_html=True,
+        )
+
+        st.selectbox(
+            "Writing Tone",
+            TONE_OPTIONS,
+            index=TONE_OPTIONS.index(st.session_state.tone),
+            help="Sets the voice and style of the generated blog post",
+            key="tone_field",
+            on_change=_update_config,
+        )
+
+        length_label = st.select_slider(
+            "Content Length",
+            options=list(LENGTH_OPTIONS.keys()),
+            value=st.session_state.length_label,
+            key="length_field",
+            on_change=_update_config,
+        )
+
+        st.checkbox(
+            "Advanced SEO Mode",
+            value=st.session_state.advanced_seo,
+            help="Adds secondary keywords, heading suggestions, keyword density & link opportunities",
+            key="seo_field",
+            on_change=_update_config,
+        )
+
+        st.divider()
+
+        can_generate = url_valid and bool(GROQ_API_KEY)
+
+        # ── FEATURE 6: ETA display under generate button ──────────────────────
+        eta_sec = ETA_SECONDS.get(st.session_state.word_count_target, 55)
+
+        st.markdown(f"""
+<div style="margin-bottom:8px;">
+  <div class="eta-badge">⏱ Est. ~{eta_sec}s for {length_label.split('(')[0].strip()}</div>
+</div>
+""", unsafe_allow_html=True)
+
+        if st.button(
+            "✨  Generate Blog Post",
+            disabled=not can_generate,
+            use_container_width=True,
+            help=(
+                "Start the 5-agent blog generation pipeline" if can_generate
+                else ("Add GROQ_API_KEY to secrets.toml" if not GROQ_API_KEY
+                      else "Enter a valid YouTube URL first")
+            ),
+        ):
+            st.session_state.stage            = "processing"
+            st.session_state.error            = None
+            st.session_state.blog_content     = ""
+            st.session_state.show_confetti    = False
+            st.session_state.agent_thoughts   = {}
+            st.session_state.processing_start = time.time()
+            st.session_state.pipeline_events  = None
+            st.session_state.chunk_progress   = None
+            st.session_state.latest_output    = None
+            for agent in st.session_state.agent_statuses:
+                st.session_state.agent_statuses[agent] = {"status": "pending", "duration": 0}
+            st.rerun()
+
+        if not GROQ_API_KEY:
+            st.caption("🔑 Add GROQ_API_KEY to secrets.toml")
+        elif not url_valid:
+            st.caption("Paste a YouTube URL above to get started")
+
+        _sidebar_workflow_progress()
+
     st.markdown(
         '<p style="font-size:11px;color:#475569;text-align:center;margin-top:20px;">'
         'DocMind Studio v3.0 · 5-Agent Groq Pipeline</p>',
@@ -554,7 +826,7 @@ with st.sidebar:
 if st.session_state.stage == "input":
 
     if st.session_state.error:
-        err_html       = st.session_state.error.replace("\n\n","<br><br>").replace("\n","<br>")
+        err_html       = st.session_state.error.replace("\n", "<br>")
         is_no_captions = any(k in st.session_state.error.lower() for k in
                              ["no captions","no transcript","has no captions"])
         is_ip_block = any(k in st.session_state.error.lower() for k in
@@ -730,26 +1002,19 @@ elif st.session_state.stage == "processing":
         ("Quality Reviewer",   "✅", ["Checking grammar and style…","Eliminating redundancy…","Verifying tone consistency…","Final polish…"]),
     ]
 
-    # Header with live timer
-    elapsed_now = int(time.time() - st.session_state.processing_start) if st.session_state.processing_start else 0
-    eta_map2    = {800: 35, 1500: 55, 2500: 90, 4000: 140}
-    eta_total   = eta_map2.get(st.session_state.word_count_target, 55)
-    remain      = max(0, eta_total - elapsed_now)
-
-    st.markdown(f"""
-<div style="margin-bottom:20px;">
-  <div style="font-family:'Bricolage Grotesque',sans-serif;font-size:26px;font-weight:600;
-              color:#f1f5f9;margin-bottom:12px;">🤖 Multi-Agent Pipeline Running</div>
-  <div class="progress-time-row">
-    <div class="timer-badge"><span class="timer-dot"></span> {elapsed_now}s elapsed</div>
-    <div class="eta-badge">⏳ ~{remain}s remaining</div>
-    <div style="font-size:13px;color:#64748b;">5 agents collaborating in sequence</div>
-  </div>
-</div>""", unsafe_allow_html=True)
-
-    # Transcript fetch
-    transcript_ph = st.empty()
-    transcript_ph.markdown("""
+    # Card HTML only varies by progress / duration once an agent is known,
+    # so render each agent's templates once and just .format() them later.
+    CARD_PENDING  = {name: get_agent_card_html(name, icon, "pending", [], 0)
+                     for name, icon, tasks in agent_defs}
+    CARD_ACTIVE   = {name: get_agent_card_html(name, icon, "active", tasks[:2], "{pct}")
+                     for name, icon, tasks in agent_defs}
+    CARD_COMPLETE = {name: get_agent_card_html(name, icon, "complete", tasks, 100, "{duration}")
+                     for name, icon, tasks in agent_defs}
+
+    # ── First run: fetch transcript, then start the pipeline thread ────────
+    if st.session_state.pipeline_events is None:
+        transcript_ph = st.empty()
+        transcript_ph.markdown("""
 <div style="background:#1a2332;border:1px solid rgba(6,182,212,0.3);
      border-radius:12px;padding:16px 20px;margin-bottom:16px;
      display:flex;align-items:center;gap:12px;">
@@ -760,254 +1025,261 @@ elif st.session_state.stage == "processing":
   </div>
 </div>""", unsafe_allow_html=True)
 
-    success, formatted, raw, err_msg = fetch_transcript(st.session_state.video_id)
-    transcript_ph.empty()
-
-    if not success:
-        st.session_state.stage = "input"
-        st.session_state.error = err_msg
-        st.rerun()
-
-    st.session_state.transcript_formatted = formatted
-    st.session_state.transcript_raw       = raw
+        success, formatted, raw, err_msg = fetch_transcript(st.session_state.video_id)
+        transcript_ph.empty()
 
-    # Agent card placeholders + thought bubble placeholders
-    placeholders       = {name: st.empty() for name, _, _ in agent_defs}
-    thought_holders    = {name: st.empty() for name, _, _ in agent_defs}
-
-    for name, icon, _ in agent_defs:
-        placeholders[name].markdown(
-            get_agent_card_html(name, icon, "pending", [], 0),
-            unsafe_allow_html=True,
-        )
+        if not success:
+            st.session_state.stage = "input"
+            st.session_state.error = err_msg
+            st.rerun()
 
-    stage_ph = st.empty()
-    stage_ph.markdown(get_stage_bar_html(1), unsafe_allow_html=True)
+        st.session_state.transcript_formatted = formatted
+        st.session_state.transcript_raw       = raw
+
+        events = queue.Queue()
+        st.session_state.pipeline_events = events
+        st.session_state.pipeline_start  = time.time()
+        threading.Thread(
+            target=_pump_pipeline,
+            args=(events,),
+            kwargs={
+                "api_key":     GROQ_API_KEY,
+                "transcript":  chunk_transcript(raw, max_words=7000),
+                "tone":        st.session_state.tone,
+                "word_count":  st.session_state.word_count_target,
+                "seo_mode":    st.session_state.seo_mode,
+                "max_workers": GROQ_MAX_WORKERS,
+                "condense":    CONDENSE_LONG_TRANSCRIPTS,
+            },
+            daemon=True,
+        ).start()
 
     import random
 
-    def show_thought(name):
-        """Show a random thought bubble for the active agent."""
-        thoughts = AGENT_THOUGHTS.get(name, [])
-        if thoughts:
-            thought = random.choice(thoughts)
-            thought_holders[name].markdown(
-                f'<div class="thought-bubble">{thought}</div>',
-                unsafe_allow_html=True,
+    # Ticks every 250ms: drain whatever the pipeline thread posted since the
+    # last tick, fold it into session state, then draw from that state. Each
+    # tick re-sends the card panel and the latest agent output (up to a whole
+    # blog draft), so this stays a little coarser than the 100ms a pure event
+    # drain would want; a quarter second still reads as immediate.
+    @st.fragment(run_every=0.25)
+    def _render_pipeline_progress():
+        statuses = st.session_state.agent_statuses
+        thoughts = st.session_state.agent_thoughts
+        result = error = None
+
+        events = st.session_state.pipeline_events
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+            kind = event["event"]
+            if kind == "chunk":
+                st.session_state.chunk_progress = (event["done"], event["total"])
+            elif kind == "start":
+                statuses[event["agent"]]["status"] = "active"
+                # ← FEATURE 4: pick the thought once so it doesn't change every tick
+                thoughts[event["agent"]] = random.choice(AGENT_THOUGHTS[event["agent"]])
+            elif kind == "complete":
+                name = event["agent"]
+                statuses[name] = {"status": "complete", "duration": event["duration"]}
+                thoughts.pop(name, None)
+                st.session_state.latest_output = (name, event["output"])
+                if name in ("Blog Writer", "Quality Reviewer"):
+                    st.session_state.blog_content = event["output"]
+            elif kind == "done":
+                result = event["result"]
+            else:
+                error = event["error"]
+
+        if error is not None:
+            err_lower = error.lower()
+            st.session_state.error = next(
+                (m for keys, m in GENERATION_ERRORS if all(k in err_lower for k in keys)),
+                f"Generation failed: {error[:200]}. Please try again.",
             )
+            st.session_state.stage           = "input"
+            st.session_state.pipeline_events = None
+            st.rerun()
 
-    try:
-        from agents import run_agent_pipeline
+        if result is not None:
+            st.session_state.blog_content    = result["blog_content"]
+            st.session_state.seo_metadata    = _render_blog(result["blog_content"])[2]
+            st.session_state.generation_time = round(time.time() - st.session_state.pipeline_start, 1)
+            st.session_state.show_confetti   = True    # ← FEATURE 5 flag
+            st.session_state.stage           = "output"
+            st.session_state.pipeline_events = None
+            st.rerun()
 
-        raw_to_process = chunk_transcript(st.session_state.transcript_raw, max_words=7000)
-        gen_start      = time.time()
+        # Header with live timer
+        elapsed_now = int(time.time() - st.session_state.processing_start) if st.session_state.processing_start else 0
+        eta_total   = ETA_SECONDS.get(st.session_state.word_count_target, 55)
+        remain      = max(0, eta_total - elapsed_now)
 
-        def on_agent_start(idx, name):
-            ag_key = list(st.session_state.agent_statuses.keys())[idx]
-            st.session_state.agent_statuses[ag_key]["status"] = "active"
-            _, icon, tasks = agent_defs[idx]
-            placeholders[name].markdown(
-                get_agent_card_html(name, icon, "active", tasks[:2], 35),
-                unsafe_allow_html=True,
-            )
-            show_thought(name)   # ← FEATURE 4
-            stage_ph.markdown(get_stage_bar_html(idx + 1), unsafe_allow_html=True)
-
-        def on_agent_complete(idx, name, duration):
-            ag_key = list(st.session_state.agent_statuses.keys())[idx]
-            st.session_state.agent_statuses[ag_key]["status"]  = "complete"
-            st.session_state.agent_statuses[ag_key]["duration"] = duration
-            _, icon, tasks = agent_defs[idx]
-            placeholders[name].markdown(
-                get_agent_card_html(name, icon, "complete", tasks, 100, duration),
+        st.markdown(f"""
+<div style="margin-bottom:20px;">
+  <div style="font-family:'Bricolage Grotesque',sans-serif;font-size:26px;font-weight:600;
+              color:#f1f5f9;margin-bottom:12px;">🤖 Multi-Agent Pipeline Running</div>
+  <div class="progress-time-row">
+    <div class="timer-badge"><span class="timer-dot"></span> {elapsed_now}s elapsed</div>
+    <div class="eta-badge">⏳ ~{remain}s remaining</div>
+    <div style="font-size:13px;color:#64748b;">5 agents collaborating — strategy &amp; SEO in parallel</div>
+  </div>
+</div>""", unsafe_allow_html=True)
+
+        current_stage = 1
+        panel = []
+        for idx, (name, icon, _) in enumerate(agent_defs):
+            status = statuses[name]["status"]
+            if status == "complete":
+                card = CARD_COMPLETE[name].format(duration=statuses[name]["duration"])
+            elif status == "active":
+                card = CARD_ACTIVE[name].format(pct=35)
+            elif name == "Research Analyst" and st.session_state.chunk_progress:
+                # Long transcripts are condensed in parallel before the Research Analyst runs
+                done, total = st.session_state.chunk_progress
+                card = get_agent_card_html(name, icon, "active",
+                                           [f"Condensing long transcript — part {done}/{total}"],
+                                           int(35 * done / total))
+            else:
+                card = CARD_PENDING[name]
+            panel.append(card)
+            if name in thoughts:
+                panel.append(f'<div class="thought-bubble">{thoughts[name]}</div>')
+            if status != "pending":
+                current_stage = idx + 1
+
+        panel.append(get_stage_bar_html(current_stage))
+        render_html(*panel)
+
+        # Newest agent output, so users see content before the pipeline ends
+        if st.session_state.latest_output:
+            name, output = st.session_state.latest_output
+            if name in ("Blog Writer", "Quality Reviewer"):
+                output = clean_blog_for_display(output)
+            st.markdown(
+                f'<div style="font-size:11px;font-weight:600;letter-spacing:0.12em;'
+                f'text-transform:uppercase;color:#64748b;margin:20px 0 8px;">'
+                f'Latest output — {name}</div>',
                 unsafe_allow_html=True,
             )
-            thought_holders[name].empty()   # clear thought bubble on complete
-
-        result = run_agent_pipeline(
-            api_key=GROQ_API_KEY,
-            transcript=raw_to_process,
-            tone=st.session_state.tone,
-            word_count=st.session_state.word_count_target,
-            seo_mode=st.session_state.seo_mode,
-            progress_callbacks={
-                "on_agent_start":    on_agent_start,
-                "on_agent_complete": on_agent_complete,
-            },
-        )
-
-        st.session_state.blog_content    = result["blog_content"]
-        st.session_state.seo_metadata    = parse_blog_metadata(result["blog_content"])
-        st.session_state.generation_time = round(time.time() - gen_start, 1)
-        st.session_state.show_confetti   = True    # ← FEATURE 5 flag
-        st.session_state.stage           = "output"
-        st.rerun()
+            st.markdown(output)
 
-    except Exception as e:
-        err_str = str(e)
-        if "rate" in err_str.lower() or "429" in err_str:
-            msg = "⏱ Rate limit reached. Please wait 60 seconds and try again."
-        elif "invalid" in err_str.lower() and "api" in err_str.lower():
-            msg = "🔑 Invalid API key. Please check your GROQ_API_KEY in secrets.toml."
-        elif "token" in err_str.lower() and "limit" in err_str.lower():
-            msg = "📄 Video is too long for the free tier. Try a shorter video (under 30 min)."
-        else:
-            msg = f"Generation failed: {err_str[:200]}. Please try again."
-        st.session_state.error = msg
-        st.session_state.stage = "input"
-        st.rerun()
+    _render_pipeline_progress()
 
 
 # ── STAGE: OUTPUT ─────────────────────────────────────────────────────────────
 elif st.session_state.stage == "output":
 
     blog       = st.session_state.blog_content
-    meta       = st.session_state.seo_metadata
-    wc         = count_words(blog)
     tone_label = st.session_state.tone
     seo_mode   = st.session_state.seo_mode
     gen_time   = st.session_state.generation_time
-    clean_blog = clean_blog_for_display(blog)
-    blog_html  = md.markdown(clean_blog, extensions=['fenced_code', 'tables'])
+    clean_blog, blog_html, meta, wc, seo_title_safe, meta_desc_safe = _render_blog(blog)
+
+    def export_payload(kind: str):
+        """Deferred download data — the payload is only built when clicked."""
+        return lambda: _build_exports(blog, clean_blog, blog_html, seo_title_safe, meta_desc_safe)[kind]
 
     # ── FEATURE 5: Confetti on first load of output ────────────────────────
     if st.session_state.get("show_confetti", False):
-        st.markdown(CONFETTI_JS, unsafe_allow_html=True)
+        # st.iframe rejects height=0; the hidden host keeps the 1px frame off-page
+        with st.container(key="confetti_host"):
+            html_iframe(CONFETTI_HTML, height=1)
         st.session_state.show_confetti = False
 
     # ── Success celebration header ─────────────────────────────────────────
     st.markdown(f"""
-<div style="text-align:center;padding:32px 20px 24px;
-     background:linear-gradient(135deg,rgba(16,185,129,0.08),rgba(6,182,212,0.06));
-     border-radius:16px;margin-bottom:24px;border:1px solid rgba(16,185,129,0.2);">
+<div class="success-header">
   <div class="success-ring">🎉</div>
-  <div style="font-family:'Bricolage Grotesque',sans-serif;font-size:28px;
-              font-weight:600;color:#f1f5f9;margin-bottom:6px;">Blog Post Generated!</div>
-  <div style="font-family:Inter,sans-serif;font-size:14px;color:#64748b;">
+  <div class="success-header-title">Blog Post Generated!</div>
+  <div class="success-header-stats">
     {format_word_count(wc)} · {tone_label} Tone · {seo_mode} SEO · 
-    <span style="color:#10b981;">⚡ Generated in {gen_time}s</span>
+    <span class="success-header-time">⚡ Generated in {gen_time}s</span>
   </div>
 </div>""", unsafe_allow_html=True)
 
     # ── FEATURE 2: Floating action bar ─────────────────────────────────────
-    st.markdown(f"""
-<div class="floating-bar">
-  <div class="fab-btn" onclick="
-    var el = document.querySelector('.blog-content-text');
-    if(el){{navigator.clipboard.writeText(el.innerText);
-    this.innerHTML='✅ Copied!';
-    setTimeout(()=>this.innerHTML='📋 Copy',1500);}}">
-    📋 Copy
-  </div>
-  <a class="fab-btn" href="data:text/markdown;charset=utf-8,{{}}" download="blog.md"
-     style="text-decoration:none;">⬇ .md</a>
-</div>""", unsafe_allow_html=True)
+    # Copy runs in a small script iframe (st.markdown never executes scripts);
+    # .md is a download button reusing the deferred export payload.
+    with st.container(key="floating_bar"):
+        html_iframe(_copy_button_html(clean_blog), width=110, height=42)
+        st.download_button("⬇ .md", data=export_payload("md"),
+                           file_name=f"docmind-{st.session_state.video_id}.md",
+                           mime="text/markdown", key="fab_md")
+
+    # Toggling Split View only reruns this fragment, not the whole script
+    @st.fragment
+    def _render_blog_view(clean_blog: str, blog_html: str, meta: dict):
+        # ── FEATURE 3: Split View toggle ───────────────────────────────────────
+        col_hdr, col_toggle = st.columns([4, 1])
+        with col_hdr:
+            st.markdown("""
+<div class="output-title">📄 Your Blog Post</div>""",
+                unsafe_allow_html=True)
+        with col_toggle:
+            split_mode = st.toggle("⚡ Split View", value=st.session_state.split_view,
+                                   help="Show raw Markdown alongside rendered preview")
+            st.session_state.split_view = split_mode
+
+        # SEO section
+        st.markdown(get_seo_section_html(
+            meta.get("seo_title",""),
+            meta.get("meta_description",""),
+            meta.get("primary_keyword",""),
+            meta.get("secondary_keywords",[]),
+        ), unsafe_allow_html=True)
 
-    # ── FEATURE 3: Split View toggle ───────────────────────────────────────
-    col_hdr, col_toggle = st.columns([4, 1])
-    with col_hdr:
         st.markdown("""
-<div style="font-family:'Bricolage Grotesque',sans-serif;font-size:20px;
-     font-weight:600;color:#f1f5f9;margin-bottom:4px;">📄 Your Blog Post</div>""",
-            unsafe_allow_html=True)
-    with col_toggle:
-        split_mode = st.toggle("⚡ Split View", value=st.session_state.split_view,
-                               help="Show raw Markdown alongside rendered preview")
-        st.session_state.split_view = split_mode
-
-    # SEO section
-    st.markdown(get_seo_section_html(
-        meta.get("seo_title",""),
-        meta.get("meta_description",""),
-        meta.get("primary_keyword",""),
-        meta.get("secondary_keywords",[]),
-    ), unsafe_allow_html=True)
-
-    st.markdown("""
-<hr style="border:none;height:1px;
-    background:linear-gradient(90deg,#ec4899,#a855f7,transparent);margin:24px 0;">
+<hr class="grad-hr">
 """, unsafe_allow_html=True)
 
-    # ── FEATURE 1: Typewriter effect + FEATURE 3: Split view ───────────────
-    if split_mode:
-        # Split view: raw markdown | rendered preview
-        st.markdown("""
-<div style="display:flex;gap:4px;margin-bottom:8px;">
-  <div style="flex:1;font-size:11px;font-weight:600;letter-spacing:0.12em;
-       text-transform:uppercase;color:#64748b;padding-left:4px;">
-    📝 Raw Markdown
-  </div>
-  <div style="flex:1;font-size:11px;font-weight:600;letter-spacing:0.12em;
-       text-transform:uppercase;color:#64748b;padding-left:4px;">
-    👁 Rendered Preview
-  </div>
+        # ── FEATURE 1: Typewriter effect + FEATURE 3: Split view ───────────────
+        if split_mode:
+            # Split view: raw markdown | rendered preview
+            st.markdown("""
+<div class="split-labels">
+  <div class="split-label">📝 Raw Markdown</div>
+  <div class="split-label">👁 Rendered Preview</div>
 </div>""", unsafe_allow_html=True)
 
-        left_col, right_col = st.columns(2)
-        with left_col:
-            st.markdown(
-                f'<div class="split-left">{clean_blog}</div>',
-                unsafe_allow_html=True,
-            )
-        with right_col:
-            st.markdown(
-                f'<div class="split-right blog-content-text">{blog_html}</div>',
-                unsafe_allow_html=True,
-            )
-    else:
-        # ── FEATURE 1: Typewriter animation via JS ──────────────────────
-        # Blog appears section by section with a smooth reveal
-        sections = re.split(r'(?=\n## |\n# )', clean_blog)
-        sections = [s.strip() for s in sections if s.strip()]
-
-        st.markdown(f"""
-<div style="background:#1a2332;border:1px solid rgba(148,163,184,0.12);
-     border-radius:16px;padding:40px;" id="blog-output">
-  <div class="blog-content-text" style="font-family:'Newsreader',Georgia,serif;
-       font-size:17px;line-height:1.8;color:#f1f5f9;">
-    {blog_html}
-  </div>
-</div>
-<script>
-(function(){{
-  var el = document.getElementById('blog-output');
-  if(!el) return;
-  el.style.opacity = '0';
-  el.style.transform = 'translateY(16px)';
-  el.style.transition = 'opacity 0.6s ease, transform 0.6s ease';
-  setTimeout(function(){{
-    el.style.opacity = '1';
-    el.style.transform = 'translateY(0)';
-  }}, 100);
-
-  // Animate each paragraph sequentially
-  var paras = el.querySelectorAll('p, h1, h2, h3, li');
-  paras.forEach(function(p, i){{
-    p.style.opacity = '0';
-    p.style.transform = 'translateY(10px)';
-    p.style.transition = 'opacity 0.4s ease, transform 0.4s ease';
-    setTimeout(function(){{
-      p.style.opacity = '1';
-      p.style.transform = 'translateY(0)';
-    }}, 200 + i * 40);
-  }});
-}})();
-</script>""", unsafe_allow_html=True)
+            left_col, right_col = st.columns(2)
+            with left_col:
+                st.markdown(
+                    f'<div class="split-left">{clean_blog}</div>',
+                    unsafe_allow_html=True,
+                )
+            with right_col:
+                st.markdown(
+                    f'<div class="split-right blog-content-text">{blog_html}</div>',
+                    unsafe_allow_html=True,
+                )
+        else:
+            # ── FEATURE 1: Typewriter reveal ─────────────────────────────────
+            # Blog appears section by section: each section is its own element,
+            # so the first one paints without waiting for the rest, and slides
+            # in on a staggered CSS animation-delay (no script needed).
+            for i, section_html in enumerate(_render_sections(clean_blog)):
+                st.markdown(
+                    f'<div class="blog-section blog-content-text" '
+                    f'style="animation-delay:{min(i, 10) * 120}ms">{section_html}</div>',
+                    unsafe_allow_html=True,
+                )
+
+    _render_blog_view(clean_blog, blog_html, meta)
 
     st.markdown(get_stage_bar_html(5), unsafe_allow_html=True)
 
     # ── Export buttons ──────────────────────────────────────────────────────
     st.markdown("""
-<div style="margin-top:28px;margin-bottom:12px;font-family:Inter,sans-serif;
-     font-size:10px;font-weight:600;letter-spacing:0.15em;
-     text-transform:uppercase;color:#64748b;">EXPORT YOUR BLOG POST</div>
+<div class="export-label">EXPORT YOUR BLOG POST</div>
 """, unsafe_allow_html=True)
 
     col1, col2, col3 = st.columns(3)
     with col1:
         st.download_button(
             label="⬇ Download Markdown (.md)",
-            data=blog,
+            data=export_payload("md"),
             file_name=f"docmind-{st.session_state.video_id}.md",
             mime="text/markdown",
             use_container_width=True,
@@ -1015,33 +1287,24 @@ elif st.session_state.stage == "output":
     with col2:
         st.download_button(
             label="⬇ Download Text (.txt)",
-            data=clean_blog,
+            data=export_payload("txt"),
             file_name=f"docmind-{st.session_state.video_id}.txt",
             mime="text/plain",
             use_container_width=True,
         )
     with col3:
-        seo_title_safe = meta.get("seo_title","Blog Post").replace('"','&quot;')
-        meta_desc_safe = meta.get("meta_description","").replace('"','&quot;')
         st.download_button(
             label="⬇ Download HTML (.html)",
-            data=f"""<!DOCTYPE html>
-<html lang="en"><head><meta charset="UTF-8"><title>{seo_title_safe}</title>
-<meta name="description" content="{meta_desc_safe}">
-<style>body{{max-width:800px;margin:60px auto;font-family:Georgia,serif;
-font-size:18px;line-height:1.8;color:#1a1a1a;padding:0 20px}}
-h1{{font-size:36px}}h2{{font-size:28px}}h3{{font-size:22px}}
-pre{{background:#f4f4f4;padding:16px;border-radius:8px;overflow-x:auto}}
-code{{background:#f0f0f0;padding:2px 6px;border-radius:4px}}
-blockquote{{border-left:3px solid #ec4899;padding:12px 20px;background:#fafafa}}
-</style></head><body>{blog_html}</body></html>""",
+            data=export_payload("html"),
             file_name=f"docmind-{st.session_state.video_id}.html",
             mime="text/html",
             use_container_width=True,
         )
 
     st.markdown("<br>", unsafe_allow_html=True)
-    with st.expander("📋 View & Copy Raw Markdown"):
+    # st.expander always ships its body; a toggle only sends the code block
+    # (and its syntax highlighting) once the user asks for it.
+    if st.toggle("📋 View & Copy Raw Markdown", key="show_raw_markdown"):
         st.code(blog, language="markdown")
 
     st.markdown("<br>", unsafe_allow_html=True)
@@ -1054,8 +1317,11 @@ blockquote{{border-left:3px solid #ec4899;padding:12px 20px;background:#fafafa}}
                 "transcript_raw": "", "seo_metadata": {},
                 "error": None, "show_confetti": False,
                 "split_view": False, "agent_thoughts": {},
-                "processing_start": None,
+                "processing_start": None, "pipeline_events": None,
+                "chunk_progress": None, "latest_output": None,
+                "agent_statuses": {
+                    agent: {"status": "pending", "duration": 0}
+                    for agent in st.session_state.agent_statuses
+                },
             })
-            for agent in st.session_state.agent_statuses:
-                st.session_state.agent_statuses[agent] = {"status":"pending","duration":0}
             st.rerun()
@@ -3,9 +3,48 @@ DocMind Studio — Complete CSS Design System
 Pink/Purple creative automation studio aesthetic
 """
 
+import hashlib
+import re
+from functools import lru_cache
+from html import escape
+from itertools import islice
+from string import Template
+
+import streamlit as st
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+_STYLE_BLOCK_RE = re.compile(r"(<style>)(.*?)(</style>)", re.S)
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and collapse whitespace; the source stays readable below."""
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_SPACE_RE.sub(" ", css)
+    css = _CSS_PUNCT_RE.sub(r"\1", css)
+    css = css.replace(": ", ":").replace(";}", "}")
+    return css.strip()
+
+
+def _hashed_style(match: re.Match) -> str:
+    css = _minify_css(match.group(2))
+    digest = hashlib.sha256(css.encode()).hexdigest()[:8]
+    return f'<style data-hash="{digest}">{css}</style>'
+
+
+def _minify_styles(blob: str) -> str:
+    """Minify every <style> block, tag it with a content hash, and drop the
+    blank lines between tags. The hash lets the browser side tell whether a
+    re-sent sheet actually changed."""
+    blob = _STYLE_BLOCK_RE.sub(_hashed_style, blob)
+    return "".join(line.strip() for line in blob.splitlines())
+
+
 FONTS_AND_STYLES = """
 <link rel="preconnect" href="https://fonts.googleapis.com">
-<link href="https://fonts.googleapis.com/css2?family=Bricolage+Grotesque:wght@400;500;600;700&family=Inter:wght@400;500;600&family=Newsreader:ital,wght@0,400;0,600;1,400&family=JetBrains+Mono&display=swap" rel="stylesheet">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link href="https://fonts.googleapis.com/css2?family=Bricolage+Grotesque:wght@600;700&family=Inter:wght@400;500;600&family=Newsreader:ital,wght@0,400;0,600;1,400&family=JetBrains+Mono&display=swap" rel="stylesheet">
 
 <style>
 /* ============================
@@ -51,9 +90,15 @@ FONTS_AND_STYLES = """
 /* ============================
    GLOBAL RESET & BASE
    ============================ */
-*, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
-
-html, body, [class*="css"], .stApp {
+html { box-sizing: border-box; }
+*, *::before, *::after { box-sizing: inherit; }
+body { margin: 0; padding: 0; }
+/* Element reset for the app's own HTML (blog body, cards, panels), which all
+   renders inside markdown containers; zero specificity, as the old universal
+   rule had, so every class-level rule still wins */
+:where(.stMarkdown) *, :where(.stMarkdown) *::before, :where(.stMarkdown) *::after { margin: 0; padding: 0; }
+
+html, body, .stApp {
   font-family: var(--font-ui) !important;
   background-color: var(--color-base) !important;
   color: var(--text-primary) !important;
@@ -89,7 +134,7 @@ html, body, [class*="css"], .stApp {
 /* ============================
    TEXT INPUT
    ============================ */
-.stTextInput > div > div > input {
+[data-testid="stTextInputRootElement"] input {
   background: var(--color-surface-1) !important;
   border: 1px solid var(--color-border) !important;
   border-radius: 12px !important;
@@ -100,124 +145,127 @@ html, body, [class*="css"], .stApp {
   transition: all 150ms ease !important;
 }
 
-.stTextInput > div > div > input:focus {
+[data-testid="stTextInputRootElement"] input:focus {
   border: 2px solid var(--accent-pink) !important;
   box-shadow: 0 0 0 4px rgba(236,72,153,0.12) !important;
   outline: none !important;
 }
 
-.stTextInput > div > div > input::placeholder {
+[data-testid="stTextInputRootElement"] input::placeholder {
   color: var(--text-dim) !important;
 }
 
 /* ============================
    SELECTBOX
    ============================ */
-.stSelectbox > div > div {
+.stSelectbox [data-baseweb="select"] > div {
   background: var(--color-surface-2) !important;
   border: 1px solid var(--color-border) !important;
   border-radius: 8px !important;
   color: var(--text-primary) !important;
 }
 
-.stSelectbox > div > div:hover {
+.stSelectbox [data-baseweb="select"] > div:hover {
   border-color: rgba(236,72,153,0.4) !important;
 }
 
 /* ============================
    SLIDER
    ============================ */
-.stSlider > div > div > div > div {
+[data-baseweb="slider"] [role="slider"] {
   background: var(--gradient-progress) !important;
 }
 
-.stSlider [data-baseweb="slider"] > div > div > div {
+[data-baseweb="slider"] > div:first-child {
   background: var(--color-surface-3) !important;
 }
 
 /* ============================
    BUTTONS
    ============================ */
-.stButton > button {
-  background: var(--gradient-cta) !important;
-  border: none !important;
-  border-radius: 12px !important;
-  color: white !important;
-  font-family: var(--font-ui) !important;
-  font-size: 15px !important;
-  font-weight: 600 !important;
-  padding: 14px 24px !important;
-  width: 100% !important;
-  box-shadow: 0 4px 16px rgba(236,72,153,0.3) !important;
-  transition: all 200ms ease !important;
-  cursor: pointer !important;
+/* Streamlit styles these with single Emotion classes, so one extra .stApp
+   level outranks them without !important. BaseWeb inputs and the sidebar
+   keep !important: they carry inline or atomic styles. */
+.stApp .stButton > button {
+  background: var(--gradient-cta);
+  border: none;
+  border-radius: 12px;
+  color: white;
+  font-family: var(--font-ui);
+  font-size: 15px;
+  font-weight: 600;
+  padding: 14px 24px;
+  width: 100%;
+  box-shadow: 0 4px 16px rgba(236,72,153,0.3);
+  transition: all 200ms ease;
+  cursor: pointer;
 }
 
-.stButton > button:hover {
-  transform: scale(1.02) !important;
-  box-shadow: 0 8px 24px rgba(236,72,153,0.4) !important;
-  filter: brightness(1.1) !important;
+.stApp .stButton > button:hover {
+  transform: scale(1.02);
+  box-shadow: 0 8px 24px rgba(236,72,153,0.4);
+  filter: brightness(1.1);
 }
 
-.stButton > button:active {
-  transform: scale(0.99) !important;
+.stApp .stButton > button:active {
+  transform: scale(0.99);
 }
 
-.stButton > button:disabled {
-  background: var(--color-surface-3) !important;
-  color: var(--text-dim) !important;
-  box-shadow: none !important;
-  transform: none !important;
-  cursor: not-allowed !important;
+.stApp .stButton > button:disabled {
+  background: var(--color-surface-3);
+  color: var(--text-dim);
+  box-shadow: none;
+  transform: none;
+  cursor: not-allowed;
 }
 
 /* ============================
    DOWNLOAD BUTTONS
    ============================ */
-.stDownloadButton > button {
-  background: var(--color-surface-2) !important;
-  border: 1px solid var(--color-border) !important;
-  border-radius: 8px !important;
-  color: var(--text-primary) !important;
-  font-family: var(--font-ui) !important;
-  font-size: 14px !important;
-  font-weight: 500 !important;
-  padding: 10px 18px !important;
-  width: 100% !important;
-  box-shadow: none !important;
-  transition: all 200ms ease !important;
-  text-align: left !important;
+.stApp .stDownloadButton > button {
+  background: var(--color-surface-2);
+  border: 1px solid var(--color-border);
+  border-radius: 8px;
+  color: var(--text-primary);
+  font-family: var(--font-ui);
+  font-size: 14px;
+  font-weight: 500;
+  padding: 10px 18px;
+  width: 100%;
+  box-shadow: none;
+  transition: all 200ms ease;
+  text-align: left;
 }
 
-.stDownloadButton > button:hover {
-  background: var(--color-surface-3) !important;
-  border-left: 2px solid var(--accent-pink) !important;
-  transform: none !important;
-  box-shadow: none !important;
+.stApp .stDownloadButton > button:hover {
+  background: var(--color-surface-3);
+  border-left: 2px solid var(--accent-pink);
+  transform: none;
+  box-shadow: none;
 }
 
 /* ============================
    CHECKBOX / TOGGLE
    ============================ */
-.stCheckbox > label {
-  color: var(--text-primary) !important;
-  font-family: var(--font-ui) !important;
-  font-size: 14px !important;
+.stApp .stCheckbox > label {
+  color: var(--text-primary);
+  font-family: var(--font-ui);
+  font-size: 14px;
 }
 
-.stCheckbox > label > span {
-  background: var(--gradient-cta) !important;
-  border: none !important;
+.stCheckbox label > span {
+  background: var(--gradient-cta);
+  border: none;
 }
 
 /* ============================
    PROGRESS BAR
    ============================ */
-.stProgress > div > div > div > div {
+[data-testid="stProgressBarTrack"] > div {
   background: var(--gradient-progress) !important;
 }
 
-.stProgress > div > div > div {
+[data-testid="stProgressBarTrack"] {
   background: var(--color-surface-3) !important;
   border-radius: 4px !important;
 }
@@ -225,38 +273,37 @@ html, body, [class*="css"], .stApp {
 /* ============================
    EXPANDER
    ============================ */
-.streamlit-expanderHeader {
-  background: var(--color-surface-1) !important;
-  border: 1px solid var(--color-border) !important;
-  border-radius: 8px !important;
-  color: var(--text-primary) !important;
-  font-family: var(--font-ui) !important;
+.stApp .streamlit-expanderHeader {
+  background: var(--color-surface-1);
+  border: 1px solid var(--color-border);
+  border-radius: 8px;
+  color: var(--text-primary);
+  font-family: var(--font-ui);
 }
 
-.streamlit-expanderContent {
-  background: var(--color-surface-1) !important;
-  border: 1px solid var(--color-border) !important;
-  border-top: none !important;
+.stApp .streamlit-expanderContent {
+  background: var(--color-surface-1);
+  border: 1px solid var(--color-border);
+  border-top: none;
 }
 
 /* ============================
    LABELS
    ============================ */
-.stTextInput > label, .stSelectbox > label, 
-.stSlider > label, .stCheckbox > label > span:last-child {
-  color: var(--text-muted) !important;
-  font-family: var(--font-ui) !important;
-  font-size: 11px !important;
-  font-weight: 500 !important;
-  letter-spacing: 0.1em !important;
-  text-transform: uppercase !important;
+.stApp [data-testid="stWidgetLabel"] {
+  color: var(--text-muted);
+  font-family: var(--font-ui);
+  font-size: 11px;
+  font-weight: 500;
+  letter-spacing: 0.1em;
+  text-transform: uppercase;
 }
 
 /* ============================
    MARKDOWN
    ============================ */
-.stMarkdown {
-  color: var(--text-secondary) !important;
+.stApp .stMarkdown {
+  color: var(--text-secondary);
 }
 
 /* ============================
@@ -280,11 +327,6 @@ html, body, [class*="css"], .stApp {
   50% { transform: scale(1.3); opacity: 0.7; }
 }
 
-@keyframes shimmer {
-  0% { background-position: -200% 0; }
-  100% { background-position: 200% 0; }
-}
-
 @keyframes slideUp {
   from { transform: translateY(20px); opacity: 0; }
   to { transform: translateY(0); opacity: 1; }
@@ -295,24 +337,21 @@ html, body, [class*="css"], .stApp {
   to { opacity: 1; }
 }
 
-@keyframes spin {
-  from { transform: rotate(0deg); }
-  to { transform: rotate(360deg); }
-}
-
 @keyframes bounce-dots {
   0%, 80%, 100% { transform: scale(0.6); opacity: 0.4; }
   40% { transform: scale(1); opacity: 1; }
 }
 
+/* Glow and shimmer run on pseudo-elements via opacity/transform only,
+   so they stay on the compositor instead of repainting every frame */
 @keyframes glow-pulse {
-  0%, 100% { filter: drop-shadow(0 0 6px rgba(236,72,153,0.3)); }
-  50% { filter: drop-shadow(0 0 12px rgba(236,72,153,0.6)); }
+  0%, 100% { opacity: 0.4; }
+  50% { opacity: 1; }
 }
 
 @keyframes progress-shimmer {
-  0% { background-position: -100% 0; }
-  100% { background-position: 200% 0; }
+  from { transform: translateX(-100%); }
+  to { transform: translateX(200%); }
 }
 
 /* ============================
@@ -324,8 +363,7 @@ html, body, [class*="css"], .stApp {
   position: sticky;
   top: 0;
   z-index: 100;
-  background: rgba(10,14,26,0.9);
-  backdrop-filter: blur(24px) saturate(180%);
+  background: rgba(10,14,26,0.95);
   border-bottom: 1px solid var(--color-border);
   padding: 12px 24px;
   display: flex;
@@ -334,6 +372,17 @@ html, body, [class*="css"], .stApp {
   height: 56px;
 }
 
+/* The blur re-rasterizes everything scrolling under the sticky bar each
+   frame, so only desktop pointers get it */
+@supports (backdrop-filter: blur(1px)) {
+  @media (min-width: 1024px) and (hover: hover) {
+    .docmind-topbar {
+      background: rgba(10,14,26,0.9);
+      backdrop-filter: blur(24px) saturate(180%);
+    }
+  }
+}
+
 .docmind-logo {
   display: flex;
   align-items: center;
@@ -349,7 +398,18 @@ html, body, [class*="css"], .stApp {
   align-items: center;
   justify-content: center;
   font-size: 16px;
+  position: relative;
+}
+
+.docmind-logo-icon::after {
+  content: "";
+  position: absolute;
+  inset: 0;
+  border-radius: inherit;
+  box-shadow: 0 0 12px rgba(236,72,153,0.6);
+  pointer-events: none;
   animation: glow-pulse 3s ease infinite;
+  will-change: opacity;
 }
 
 .docmind-logo-text {
@@ -378,13 +438,17 @@ html, body, [class*="css"], .stApp {
   border-bottom: 1px solid var(--color-border);
 }
 
-.sidebar-label {
+/* Shared uppercase "eyebrow" label; each class below only adds spacing */
+.sidebar-label, .transcript-title, .seo-label, .section-header {
   font-family: var(--font-ui);
   font-size: 10px;
   font-weight: 600;
   letter-spacing: 0.15em;
   text-transform: uppercase;
   color: var(--text-muted);
+}
+
+.sidebar-label {
   margin-bottom: 12px;
 }
 
@@ -455,7 +519,7 @@ html, body, [class*="css"], .stApp {
 }
 
 .agent-dot-pending { background: var(--color-surface-3); border: 1px solid var(--text-dim); }
-.agent-dot-active { background: var(--accent-cyan); animation: pulse-dot 1.5s ease infinite; }
+.agent-dot-active { background: var(--accent-cyan); animation: pulse-dot 1.5s ease infinite; will-change: transform, opacity; }
 .agent-dot-complete { background: var(--accent-emerald); }
 
 .agent-name {
@@ -490,12 +554,7 @@ html, body, [class*="css"], .stApp {
 }
 
 .transcript-title {
-  font-family: var(--font-ui);
   font-size: 11px;
-  font-weight: 600;
-  letter-spacing: 0.15em;
-  text-transform: uppercase;
-  color: var(--text-muted);
   border-left: 3px solid var(--accent-cyan);
   padding-left: 8px;
 }
@@ -547,6 +606,7 @@ html, body, [class*="css"], .stApp {
 
 .agent-card-pending {
   opacity: 0.5;
+  animation: none;
 }
 
 .agent-card-header {
@@ -614,11 +674,20 @@ html, body, [class*="css"], .stApp {
   height: 100%;
   border-radius: 4px;
   background: var(--gradient-progress);
-  background-size: 200% 100%;
-  animation: progress-shimmer 2s ease infinite;
+  position: relative;
+  overflow: hidden;
   transition: width 500ms ease;
 }
 
+.progress-bar-fill::after {
+  content: "";
+  position: absolute;
+  inset: 0;
+  background: linear-gradient(90deg, transparent, rgba(255,255,255,0.3), transparent);
+  animation: progress-shimmer 2s ease infinite;
+  will-change: transform;
+}
+
 /* Hero Empty State */
 .hero-state {
   text-align: center;
@@ -670,12 +739,6 @@ html, body, [class*="css"], .stApp {
 }
 
 .seo-label {
-  font-family: var(--font-ui);
-  font-size: 10px;
-  font-weight: 600;
-  letter-spacing: 0.15em;
-  text-transform: uppercase;
-  color: var(--text-muted);
   margin-bottom: 4px;
 }
 
@@ -701,11 +764,11 @@ html, body, [class*="css"], .stApp {
 }
 
 /* Blog Content - Newsreader Typography */
-.blog-content {
-  font-family: var(--font-content) !important;
-  font-size: 17px !important;
-  line-height: 1.8 !important;
-  color: var(--text-primary) !important;
+.stApp .blog-content {
+  font-family: var(--font-content);
+  font-size: 17px;
+  line-height: 1.8;
+  color: var(--text-primary);
 }
 
 .blog-content h1 {
@@ -864,8 +927,7 @@ html, body, [class*="css"], .stApp {
   width: 40px;
   height: 2px;
   background: var(--color-border);
-  margin: 0 4px;
-  margin-bottom: 20px;
+  margin: 0 4px 22px;
 }
 
 .stage-connector-active { background: var(--gradient-progress); }
@@ -944,12 +1006,6 @@ html, body, [class*="css"], .stApp {
 
 /* Section Headers in Sidebar */
 .section-header {
-  font-family: var(--font-ui);
-  font-size: 10px;
-  font-weight: 600;
-  letter-spacing: 0.15em;
-  text-transform: uppercase;
-  color: var(--text-muted);
   padding: 16px 20px 8px;
 }
 
@@ -971,107 +1027,165 @@ html, body, [class*="css"], .stApp {
   margin: 8px 0;
 }
 
+/* ============================
+   REDUCED MOTION
+   ============================ */
+@media (prefers-reduced-motion: reduce) {
+  *, *::before, *::after {
+    animation-duration: 0.001ms !important;
+    animation-iteration-count: 1 !important;
+    transition-duration: 0.001ms !important;
+  }
+}
+
 </style>
 """
 
+# Shipped on every rerun, so send the minified form
+FONTS_AND_STYLES = _minify_styles(FONTS_AND_STYLES)
 
+
+STAGE_NAMES = ("Input", "Analyze", "Structure", "Write", "Review")
+_CONN_ACTIVE = '<div class="stage-connector stage-connector-active"></div>'
+_CONN_INACTIVE = '<div class="stage-connector"></div>'
+
+
+@lru_cache(maxsize=8)
 def get_stage_bar_html(current_stage: int) -> str:
     """Generate stage progression bar HTML"""
-    stages = ["Input", "Analyze", "Structure", "Write", "Review"]
-    html = '<div class="stage-bar">'
-    
-    for i, stage in enumerate(stages):
+    parts = ['<div class="stage-bar">']
+    last = len(STAGE_NAMES) - 1
+
+    for i, stage in enumerate(STAGE_NAMES):
         if i < current_stage:
-            dot_class = "stage-dot stage-dot-complete"
-            label_class = "stage-label stage-label-complete"
-            icon = "✓"
+            state, icon = " stage-dot-complete", "✓"
+            label_state = " stage-label-complete"
         elif i == current_stage:
-            dot_class = "stage-dot stage-dot-active"
-            label_class = "stage-label stage-label-active"
-            icon = str(i + 1)
+            state, icon = " stage-dot-active", i + 1
+            label_state = " stage-label-active"
         else:
-            dot_class = "stage-dot"
-            label_class = "stage-label"
-            icon = str(i + 1)
-        
-        html += f"""
-        <div class="stage-step">
-          <div class="{dot_class}">{icon}</div>
-          <span class="{label_class}">{stage}</span>
-        </div>
-        """
-        
-        if i < len(stages) - 1:
-            conn_class = "stage-connector" + (" stage-connector-active" if i < current_stage else "")
-            html += f'<div class="{conn_class}" style="margin-bottom: 22px;"></div>'
-    
-    html += '</div>'
-    return html
+            state, icon, label_state = "", i + 1, ""
+
+        parts.append(
+            f'<div class="stage-step"><div class="stage-dot{state}">{icon}</div>'
+            f'<span class="stage-label{label_state}">{stage}</span></div>'
+        )
+        if i < last:
+            parts.append(_CONN_ACTIVE if i < current_stage else _CONN_INACTIVE)
+
+    parts.append('</div>')
+    return "".join(parts)
+
+
+_AGENT_STATUS = {
+    "active": (
+        "agent-card-active",
+        "agent-status-active",
+        '<span class="typing-indicator"><span class="typing-dot"></span><span class="typing-dot"></span>'
+        '<span class="typing-dot"></span></span> Working...',
+    ),
+    "complete": ("agent-card-complete", "agent-status-complete", "✓ Complete (${duration}s)"),
+    "pending": ("agent-card-pending", "agent-status-pending", "⏸ Pending"),
+}
+
+_AGENT_PROGRESS = (
+    '<div class="progress-bar-container" style="margin-top: 12px;">'
+    '<div class="progress-bar-fill" style="width: $progress%;"></div></div>'
+    '<div style="text-align: right; font-size: 11px; color: var(--text-muted); margin-top: 4px;">$progress%</div>'
+)
+
+_AGENT_CARD_TEMPLATES = {
+    status: Template(
+        f'''<div class="agent-card {card_class}">
+  <div class="agent-card-header">
+    <div class="agent-card-title">$icon $agent_name</div>
+    <div class="agent-card-status {status_class}">{status_text}</div>
+  </div>$tasks{_AGENT_PROGRESS if status == "active" else ""}
+</div>'''
+    )
+    for status, (card_class, status_class, status_text) in _AGENT_STATUS.items()
+}
 
 
 def get_agent_card_html(agent_name: str, icon: str, status: str, tasks: list, progress: int = 0, duration: float = 0) -> str:
     """Generate agent card HTML"""
-    if status == "active":
-        card_class = "agent-card agent-card-active"
-        status_class = "agent-status-active"
-        status_text = '<span class="typing-indicator"><span class="typing-dot"></span><span class="typing-dot"></span><span class="typing-dot"></span></span> Working...'
-    elif status == "complete":
-        card_class = "agent-card agent-card-complete"
-        status_class = "agent-status-complete"
-        status_text = f"✓ Complete ({duration}s)"
-    else:
-        card_class = "agent-card agent-card-pending"
-        status_class = "agent-status-pending"
-        status_text = "⏸ Pending"
-    
+    if isinstance(progress, int):
+        progress = 5 * round(progress / 5)    # bound the cache to 21 progress steps
+    return _agent_card_html(agent_name, icon, status, tuple(tasks), progress, duration)
+
+
+@lru_cache(maxsize=64)
+def _agent_card_html(agent_name, icon, status, tasks, progress, duration):
     task_html = ""
     if tasks and status in ["active", "complete"]:
-        task_html = "<div class='agent-task-list'>"
-        for task in tasks:
-            task_html += f"<div>• {task}</div>"
-        task_html += "</div>"
-    
-    progress_html = ""
-    if status == "active":
-        progress_html = f"""
-        <div class="progress-bar-container" style="margin-top: 12px;">
-          <div class="progress-bar-fill" style="width: {progress}%;"></div>
-        </div>
-        <div style="text-align: right; font-size: 11px; color: var(--text-muted); margin-top: 4px;">{progress}%</div>
-        """
-    
-    return f"""
-    <div class="{card_class}">
-      <div class="agent-card-header">
-        <div class="agent-card-title">{icon} {agent_name}</div>
-        <div class="agent-card-status {status_class}">{status_text}</div>
-      </div>
-      {task_html}
-      {progress_html}
-    </div>
-    """
+        task_html = "<div class='agent-task-list'>" + "".join(f"<div>• {escape(t)}</div>" for t in tasks) + "</div>"
+
+    template = _AGENT_CARD_TEMPLATES.get(status, _AGENT_CARD_TEMPLATES["pending"])
+    return template.substitute(
+        agent_name=escape(agent_name), icon=icon, tasks=task_html, progress=progress, duration=duration,
+    )
+
+
+_SEO_SECTION_HEAD = '''<div class="seo-section">
+  <div style="margin-bottom: 16px;">
+    <div class="seo-label">SEO Title</div>
+    <div class="seo-title-value">$seo_title</div>
+  </div>
+  <div style="margin-bottom: 16px;">
+    <div class="seo-label">Meta Description</div>
+    <div class="seo-value">$meta_desc</div>
+  </div>'''
+
+_SEO_SECTION = Template(_SEO_SECTION_HEAD + '''
+  <div>
+    <div class="seo-label">Primary Keyword</div>
+    <div class="seo-value"><span class="keyword-pill">$primary_kw</span></div>
+  </div>
+</div>''')
+
+_SEO_SECTION_WITH_KEYWORDS = Template(_SEO_SECTION_HEAD + '''
+  <div style="margin-bottom: 16px;">
+    <div class="seo-label">Primary Keyword</div>
+    <div class="seo-value"><span class="keyword-pill">$primary_kw</span></div>
+  </div>
+  <div><div class="seo-label">Secondary Keywords</div><div style="margin-top: 6px;">$kw_pills</div></div>
+</div>''')
 
 
 def get_seo_section_html(seo_title: str, meta_desc: str, primary_kw: str, secondary_kws: list) -> str:
     """Generate SEO metadata section HTML"""
-    kw_pills = ""
-    if secondary_kws:
-        kw_pills = "".join([f'<span class="keyword-pill">{kw}</span>' for kw in secondary_kws[:8]])
-    
-    return f"""
-    <div class="seo-section">
-      <div style="margin-bottom: 16px;">
-        <div class="seo-label">SEO Title</div>
-        <div class="seo-title-value">{seo_title or "Generated SEO Title"}</div>
-      </div>
-      <div style="margin-bottom: 16px;">
-        <div class="seo-label">Meta Description</div>
-        <div class="seo-value">{meta_desc or "Generated meta description"}</div>
-      </div>
-      <div style="margin-bottom: {'16px' if secondary_kws else '0'};">
-        <div class="seo-label">Primary Keyword</div>
-        <div class="seo-value"><span class="keyword-pill">{primary_kw or "AI content"}</span></div>
-      </div>
-      {f'<div><div class="seo-label">Secondary Keywords</div><div style="margin-top: 6px;">{kw_pills}</div></div>' if secondary_kws else ''}
-    </div>
+    return _seo_section_html(seo_title, meta_desc, primary_kw, tuple(islice(secondary_kws or (), 8)))
+
+
+@lru_cache(maxsize=64)
+def _seo_section_html(seo_title, meta_desc, primary_kw, secondary_kws):
+    fields = {
+        "seo_title": escape(seo_title or "Generated SEO Title"),
+        "meta_desc": escape(meta_desc or "Generated meta description"),
+        "primary_kw": escape(primary_kw or "AI content"),
+    }
+    if not secondary_kws:
+        return _SEO_SECTION.substitute(fields)
+
+    kw_pills = "".join(f'<span class="keyword-pill">{escape(kw)}</span>' for kw in secondary_kws)
+    return _SEO_SECTION_WITH_KEYWORDS.substitute(fields, kw_pills=kw_pills)
+
+
+@lru_cache(maxsize=4)
+def _stylesheet(extra: str) -> str:
+    return FONTS_AND_STYLES + _minify_styles(extra)
+
+
+def inject_styles(extra: str = "") -> None:
+    """Emit the design system plus any page-level CSS as one markdown element.
+
+    Streamlit drops every element a rerun does not re-emit, so this has to run
+    on each rerun; what it avoids is a second <style> node per page.
     """
+    st.markdown(_stylesheet(extra), unsafe_allow_html=True)
+
+
+def render_html(*fragments: str) -> None:
+    """Emit several HTML fragments as a single markdown element, so a panel
+    of cards costs one element (and one frontend render) instead of N."""
+    st.markdown("".join(fragments), unsafe_allow_html=True)
@@ -9,85 +9,132 @@ youtube-transcript-api version compatibility:
 Strategy: probe available methods at runtime, never assume.
 """
 
+import io
 import os
+import random
 import re
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
 from typing import Optional, Tuple
 
 
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?v=|shorts/|embed/|v/)|youtu\.be/)([a-zA-Z0-9_-]{11})'
+)
+
+
+@lru_cache(maxsize=1024)
 def extract_video_id(url: str) -> Optional[str]:
     """Extract YouTube video ID from various URL formats"""
-    patterns = [
-        r'(?:youtube\.com/watch\?v=)([a-zA-Z0-9_-]{11})',
-        r'(?:youtu\.be/)([a-zA-Z0-9_-]{11})',
-        r'(?:youtube\.com/shorts/)([a-zA-Z0-9_-]{11})',
-        r'(?:youtube\.com/embed/)([a-zA-Z0-9_-]{11})',
-        r'(?:youtube\.com/v/)([a-zA-Z0-9_-]{11})',
-    ]
-    url = url.strip()
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    if 'youtu' not in url:    # every supported form has youtube.com or youtu.be
+        return None
+    match = _VIDEO_ID_RE.search(url.strip())
+    return match.group(1) if match else None
+
+
+_INVALID_URL_MSG = "Please enter a valid YouTube URL (youtube.com/watch?v=... or youtu.be/...)"
 
 
 def validate_youtube_url(url: str) -> Tuple[bool, str]:
-    if not url.strip():
+    url = url.strip()
+    if not url:
         return False, ""
     video_id = extract_video_id(url)
     if video_id:
         return True, video_id
-    return False, "Please enter a valid YouTube URL (youtube.com/watch?v=... or youtu.be/...)"
+    return False, _INVALID_URL_MSG
+
+
+def _dict_fields(entry) -> tuple:
+    return entry.get('text', ''), entry.get('start', 0)
 
 
-def _parse_entries(transcript_data) -> Tuple[list, list]:
+def _entry_fields(entry) -> tuple:
+    """Generic (text, start) extraction for an entry of unknown shape."""
+    if isinstance(entry, dict):
+        return _dict_fields(entry)
+    if hasattr(entry, 'text') and hasattr(entry, 'start'):
+        return entry.text, entry.start
+    try:
+        return _dict_fields(dict(entry))
+    except (TypeError, ValueError):
+        return '', 0    # unrecognised entry: skipped as empty text
+
+
+def _parse_entries(transcript_data) -> Tuple[str, str]:
     """
     Parse transcript entries — handles dict (old API) and object (new API) forms.
+    The shape is sniffed from the first entry; the generic path only runs for
+    entries that don't match it.
+    Returns (formatted, raw): timestamped lines, and the plain text space-joined.
     """
-    formatted_lines = []
-    raw_lines = []
-    for entry in transcript_data:
+    formatted_buf, raw_buf = io.StringIO(), io.StringIO()
+    write_formatted, write_raw = formatted_buf.write, raw_buf.write
+
+    entries = iter(transcript_data)
+    first = next(entries, None)
+    if first is None:
+        return "", ""
+    if isinstance(first, dict):
+        fields = _dict_fields
+    elif hasattr(first, 'text') and hasattr(first, 'start'):
+        fields = attrgetter('text', 'start')
+    else:
+        fields = _entry_fields
+
+    for entry in chain((first,), entries):
         try:
-            if isinstance(entry, dict):
-                text = str(entry.get('text', '')).strip()
-                start = float(entry.get('start', 0))
-            elif hasattr(entry, 'text') and hasattr(entry, 'start'):
-                text = str(entry.text).strip()
-                start = float(entry.start)
-            else:
-                try:
-                    d = dict(entry)
-                    text = str(d.get('text', '')).strip()
-                    start = float(d.get('start', 0))
-                except Exception:
-                    continue
-
-            if not text:
-                continue
-            m, s = int(start // 60), int(start % 60)
-            formatted_lines.append(f"[{m}:{s:02d}] {text}")
-            raw_lines.append(text)
-        except Exception:
+            text, start = fields(entry)
+        except (AttributeError, TypeError):
+            text, start = _entry_fields(entry)
+        text = str(text).strip()
+        if not text:
             continue
-    return formatted_lines, raw_lines
+        try:
+            m, s = divmod(int(float(start)), 60)
+        except (TypeError, ValueError, OverflowError):
+            continue    # malformed start time: skip just this entry
+        write_formatted(f"[{m}:{s:02d}] {text}\n")
+        write_raw(text)
+        write_raw(" ")
+    return formatted_buf.getvalue().rstrip("\n"), raw_buf.getvalue().rstrip(" ")
 
 
-def _build_ytt_instance():
+@lru_cache(maxsize=1)
+def _ytt_api():
     """
-    Build a YouTubeTranscriptApi instance.
-    If WEBSHARE_USERNAME + WEBSHARE_PASSWORD are set in env/secrets,
-    uses Webshare rotating residential proxies (required for cloud deployments).
-    Otherwise falls back to direct connection (works locally).
+    Import YouTubeTranscriptApi once and detect its API version.
+    Returns (YouTubeTranscriptApi, has_class_get).
     """
     from youtube_transcript_api import YouTubeTranscriptApi
 
+    # v0.x: get_transcript is a callable class/static method
+    # v1.x: must instantiate — get_transcript doesn't exist as class method
+    return YouTubeTranscriptApi, callable(getattr(YouTubeTranscriptApi, 'get_transcript', None))
+
+
+@lru_cache(maxsize=1)
+def _ytt_proxy_config():
+    """
+    Resolve, once, the proxy to use: Webshare rotating residential proxies if
+    WEBSHARE_USERNAME + WEBSHARE_PASSWORD are set in env/secrets (required for
+    cloud deployments), else None for a direct connection (works locally).
+    """
     proxy_user = os.environ.get("WEBSHARE_USERNAME", "")
     proxy_pass = os.environ.get("WEBSHARE_PASSWORD", "")
 
-    # Try Streamlit secrets too
-    if not proxy_user:
+    # Try Streamlit secrets too — only if streamlit is already loaded (the app),
+    # so CLI/script callers don't pay for importing it
+    st = sys.modules.get("streamlit")
+    if not proxy_user and st is not None:
         try:
-            import streamlit as st
             proxy_user = st.secrets.get("WEBSHARE_USERNAME", "")
             proxy_pass = st.secrets.get("WEBSHARE_PASSWORD", "")
         except Exception:
@@ -96,16 +143,176 @@ def _build_ytt_instance():
     if proxy_user and proxy_pass:
         try:
             from youtube_transcript_api.proxies import WebshareProxyConfig
-            return YouTubeTranscriptApi(
-                proxy_config=WebshareProxyConfig(
-                    proxy_username=proxy_user,
-                    proxy_password=proxy_pass,
-                )
-            ), True  # (instance, using_proxy)
+            return WebshareProxyConfig(proxy_username=proxy_user, proxy_password=proxy_pass)
         except ImportError:
             pass  # older version, fall through to direct
+    return None
+
+
+# Pool of API clients, each owning a keep-alive requests.Session. A fetch
+# checks one out for its whole fetch/list/retry sequence and hands it back, so a
+# Session (not thread-safe) is only ever used by one thread at a time, while its
+# connections outlive the short-lived script-run and worker threads that fetch.
+# The cookie jar (YouTube consent cookies) is cleared on check-in so nothing
+# carries over between unrelated users' fetches.
+YTT_POOL_SIZE = 8
+_ytt_pool = []    # idle (session, methods) entries, most recently used last
+_ytt_pool_lock = threading.Lock()
+
+
+def _checkout_ytt():
+    """
+    Take an idle client from the pool, building one if none is free.
+    Returns (session, (fetch_fn, list_fn, languages)) — session is None on v0.x.
+    """
+    with _ytt_pool_lock:
+        if _ytt_pool:
+            return _ytt_pool.pop()
+    return _build_ytt_client()
+
+
+def _checkin_ytt(entry) -> None:
+    """Return a client to the pool; beyond YTT_POOL_SIZE idle ones it is closed."""
+    session = entry[0]
+    if session is not None:
+        session.cookies.clear()
+    with _ytt_pool_lock:
+        if len(_ytt_pool) < YTT_POOL_SIZE:
+            _ytt_pool.append(entry)
+            return
+    if session is not None:
+        session.close()
+
+
+# ── IP-block circuit breaker ─────────────────────────────────────────────────
+# Once YouTube has blocked this server's IP, every further fetch burns the full
+# fetch/list/retry sequence just to fail the same way. After BREAKER_THRESHOLD
+# consecutive blocks, fail fast for BREAKER_COOLDOWN seconds, then let a single
+# probe request through (half-open) to see if the block has lifted.
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 60
+_BREAKER_OPEN_ERROR = "RequestBlocked: YouTube is blocking requests from this IP"
+_IP_BLOCKED = re.compile(r'ipblocked|requestblocked|blocking requests from your ip', re.I)
+_breaker = {"fails": 0, "opened_at": 0.0, "probing": False}
+_breaker_lock = threading.Lock()
+
+
+def _breaker_allows() -> bool:
+    with _breaker_lock:
+        if _breaker["fails"] < BREAKER_THRESHOLD:
+            return True
+        if time.time() - _breaker["opened_at"] < BREAKER_COOLDOWN or _breaker["probing"]:
+            return False
+        _breaker["probing"] = True
+        return True
+
+
+def _breaker_record(error: Optional[str]) -> None:
+    """Record a fetch outcome; error=None means no request reached YouTube."""
+    with _breaker_lock:
+        _breaker["probing"] = False
+        if error is None:
+            return
+        if error and _IP_BLOCKED.search(error):
+            _breaker["fails"] += 1
+            if _breaker["fails"] >= BREAKER_THRESHOLD:
+                _breaker["opened_at"] = time.time()
+        else:
+            _breaker["fails"] = 0
+
+
+FETCH_RETRIES = 3
+# Retry decisions go by exception type (matched by class name anywhere in the
+# MRO, so neither requests nor a specific youtube-transcript-api version has to
+# be imported) and by structured HTTP status — never by message substrings,
+# which also contain the request URL and hence the video id.
+_TRANSIENT_TYPES = frozenset({
+    'ConnectionError', 'Timeout', 'TimeoutError', 'ChunkedEncodingError',
+    'TooManyRequests',    # v0.x rate limit
+})
+_HTTP_STATUS_RE = re.compile(r'(\d{3})\b')    # requests' "503 Server Error: …"
+
+
+def _http_status(e: Exception) -> Optional[int]:
+    status = getattr(getattr(e, 'response', None), 'status_code', None)
+    if status is None:
+        # YouTubeRequestFailed keeps only str(HTTPError), which starts with the code
+        match = _HTTP_STATUS_RE.match(str(getattr(e, 'reason', '')))
+        status = int(match.group(1)) if match else None
+    return status
+
+
+def _is_transient(e: Exception) -> bool:
+    names = [cls.__name__ for cls in type(e).__mro__]
+    # IP blocks (v1.x reports YouTube's 429 as IpBlocked) won't clear in seconds
+    if any(_IP_BLOCKED.search(name) for name in names) or _IP_BLOCKED.search(str(e)):
+        return False
+    if _TRANSIENT_TYPES.intersection(names):
+        return True
+    status = _http_status(e)
+    return status is not None and (status == 429 or 500 <= status < 600)
+
+
+def _with_retry(fn, *args, **kwargs):
+    """
+    Call fn, retrying transient failures (connection errors, timeouts, 429 and
+    5xx responses) with jittered exponential backoff: ~1s then ~2s, under 5s in
+    total. Anything else — no captions, disabled, IP blocked — is re-raised at once.
+    """
+    for attempt in range(FETCH_RETRIES):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == FETCH_RETRIES - 1 or not _is_transient(e):
+                raise
+            time.sleep(2 ** attempt * (1 + random.random() * 0.5))
 
-    return YouTubeTranscriptApi(), False
+
+def _build_ytt_client():
+    """
+    Resolve the callables this API version offers, on a new client.
+    Returns (session, (fetch_fn, list_fn, languages)) — fetch_fn(video_id, **kw)
+    returns entries, list_fn(video_id) returns transcript objects; either may
+    be None.
+    """
+    YouTubeTranscriptApi, has_class_get = _ytt_api()
+
+    # OLD API (v0.x) — class methods, no session of ours to keep
+    if has_class_get:
+        return None, (YouTubeTranscriptApi.get_transcript,
+                      getattr(YouTubeTranscriptApi, 'list_transcripts', None),
+                      ['en', 'en-US', 'en-GB', 'a.en'])
+
+    # NEW API (v1.0+) — instantiate on our own Session, then .fetch() / .list()
+    import requests
+
+    session = requests.Session()
+    proxy_config = _ytt_proxy_config()
+    ytt = YouTubeTranscriptApi(proxy_config=proxy_config, http_client=session)
+    fetch_fn = getattr(ytt, 'fetch', None)
+    list_fn = getattr(ytt, 'list', None) or getattr(ytt, 'list_transcripts', None)
+    return session, (fetch_fn if callable(fetch_fn) else None,
+                     list_fn if callable(list_fn) else None,
+                     ['en', 'en-US', 'en-GB'])
+
+
+def _pick_transcript(transcripts):
+    """Prefer a manually created transcript, else the first one listed."""
+    tlist = list(transcripts)
+    for t in tlist:
+        if hasattr(t, 'is_generated') and not t.is_generated:
+            return t
+    return tlist[0] if tlist else None
+
+
+# ── Transcript cache ─────────────────────────────────────────────────────────
+# Successful fetches are kept for TRANSCRIPT_CACHE_TTL seconds, so running the
+# same video again (Generate Another, a second session) skips the network
+# round-trips entirely. Failures are never cached — they are often transient.
+TRANSCRIPT_CACHE_SIZE = 32
+TRANSCRIPT_CACHE_TTL = 3600
+_transcript_cache = OrderedDict()    # video_id → (fetched_at, result), LRU order
+_transcript_cache_lock = threading.Lock()
 
 
 def fetch_transcript(video_id: str) -> Tuple[bool, str, str, str]:
@@ -114,157 +321,162 @@ def fetch_transcript(video_id: str) -> Tuple[bool, str, str, str]:
     Supports Webshare proxy for cloud deployments (set WEBSHARE_USERNAME + WEBSHARE_PASSWORD).
     Returns: (success, formatted, raw, error_message)
     """
+    with _transcript_cache_lock:
+        cached = _transcript_cache.get(video_id)
+        if cached and time.time() - cached[0] < TRANSCRIPT_CACHE_TTL:
+            _transcript_cache.move_to_end(video_id)
+            return cached[1]
+
+    result = _fetch_transcript(video_id)
+    if result[0]:
+        with _transcript_cache_lock:
+            _transcript_cache[video_id] = (time.time(), result)
+            _transcript_cache.move_to_end(video_id)
+            while len(_transcript_cache) > TRANSCRIPT_CACHE_SIZE:
+                _transcript_cache.popitem(last=False)
+    return result
+
+
+def _fetch_transcript(video_id: str) -> Tuple[bool, str, str, str]:
+    if not _breaker_allows():
+        return _transcript_error(_BREAKER_OPEN_ERROR)
+
+    error = None    # stays None unless a request is actually sent
+    client = None
     try:
-        from youtube_transcript_api import YouTubeTranscriptApi
+        try:
+            client = _checkout_ytt()
+        except ImportError:
+            raise
+        except Exception as e:
+            return False, "", "", f"Could not initialize YouTubeTranscriptApi: {e}"
+        fetch_fn, list_fn, languages = client[1]
 
-        # ── Detect API version ───────────────────────────────────────────────
-        # v0.x: get_transcript is a callable class/static method
-        # v1.x: must instantiate — get_transcript doesn't exist as class method
-        has_class_get = callable(getattr(YouTubeTranscriptApi, 'get_transcript', None))
+        error = ""
 
         transcript_data = None
         last_error = ""
-        using_proxy = False
-
-        # ════════════════════════════════════════════════
-        # NEW API  (v1.0+)  — instantiate, then .fetch()
-        # ════════════════════════════════════════════════
-        if not has_class_get:
-            try:
-                ytt, using_proxy = _build_ytt_instance()
-            except Exception as e:
-                return False, "", "", f"Could not initialize YouTubeTranscriptApi: {e}"
-
-            has_fetch            = callable(getattr(ytt, 'fetch', None))
-            has_list             = callable(getattr(ytt, 'list', None))
-            has_list_transcripts = callable(getattr(ytt, 'list_transcripts', None))
-
-            if has_fetch:
-                for lang_args in [{'languages': ['en', 'en-US', 'en-GB']}, {}]:
-                    try:
-                        transcript_data = ytt.fetch(video_id, **lang_args)
-                        if transcript_data:
-                            break
-                    except Exception as e:
-                        last_error = str(e)
-
-            if transcript_data is None:
-                list_fn = (ytt.list if has_list
-                           else ytt.list_transcripts if has_list_transcripts
-                           else None)
-                if list_fn:
-                    try:
-                        tlist = list(list_fn(video_id))
-                        picked = None
-                        for t in tlist:
-                            if hasattr(t, 'is_generated') and not t.is_generated:
-                                picked = t
-                                break
-                        if picked is None and tlist:
-                            picked = tlist[0]
-                        if picked is not None:
-                            transcript_data = picked.fetch()
-                    except Exception as e:
-                        last_error = str(e)
-
-        # ════════════════════════════════════════════════
-        # OLD API  (v0.x)  — class methods
-        # ════════════════════════════════════════════════
-        else:
-            try:
-                transcript_data = YouTubeTranscriptApi.get_transcript(
-                    video_id, languages=['en', 'en-US', 'en-GB', 'a.en']
-                )
-            except Exception as e:
-                last_error = str(e)
 
-            if transcript_data is None:
+        if fetch_fn:
+            for lang_args in ({'languages': languages}, {}):
                 try:
-                    transcript_data = YouTubeTranscriptApi.get_transcript(video_id)
+                    transcript_data = _with_retry(fetch_fn, video_id, **lang_args)
+                    if transcript_data:
+                        break
                 except Exception as e:
                     last_error = str(e)
 
-            if transcript_data is None:
-                try:
-                    tlist = list(YouTubeTranscriptApi.list_transcripts(video_id))
-                    picked = None
-                    for t in tlist:
-                        if hasattr(t, 'is_generated') and not t.is_generated:
-                            picked = t
-                            break
-                    if picked is None and tlist:
-                        picked = tlist[0]
-                    if picked is not None:
-                        transcript_data = picked.fetch()
-                except Exception as e:
-                    last_error = str(e)
+        if not transcript_data and list_fn:
+            try:
+                picked = _pick_transcript(_with_retry(list_fn, video_id))
+                if picked is not None:
+                    transcript_data = picked.fetch()
+            except Exception as e:
+                last_error = str(e)
 
         if not transcript_data:
-            return _transcript_error(last_error or "No transcript data returned")
+            error = last_error or "No transcript data returned"
+            return _transcript_error(error)
 
-        formatted_lines, raw_lines = _parse_entries(transcript_data)
+        formatted, raw = _parse_entries(transcript_data)
 
-        if not raw_lines:
+        if not raw:
             return False, "", "", "Transcript appears to be empty. Please try another video."
 
-        return True, '\n'.join(formatted_lines), ' '.join(raw_lines), ""
+        return True, formatted, raw, ""
 
     except ImportError:
         return False, "", "", "youtube-transcript-api is not installed. Check requirements.txt."
     except Exception as e:
-        return _transcript_error(str(e))
+        error = str(e)
+        return _transcript_error(error)
+    finally:
+        if client is not None:
+            _checkin_ytt(client)
+        _breaker_record(error)
+
+
+def fetch_transcripts(video_ids, concurrency: int = 8) -> dict:
+    """
+    Fetch several transcripts concurrently on a thread pool.
+    Returns {video_id: (success, formatted, raw, error_message)}.
+    Per-video latency is unchanged; throughput scales with `concurrency`,
+    which is kept small so the batch doesn't trip YouTube's 429 limit.
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    if not video_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(video_ids))) as pool:
+        return dict(zip(video_ids, pool.map(fetch_transcript, video_ids)))
+
+
+# (category, keywords) in priority order, matched against the lowercased error
+_ERR_CATEGORIES = (
+    ("no_captions", ("no transcript", "could not retrieve", "notranscript",
+                     "no captions", "subtitles are disabled", "transcript list",
+                     "no element", "could not find")),
+    ("disabled", ("disabled", "transcriptsdisabled")),
+    ("unavailable", ("unavailable", "private", "not available", "video unavailable")),
+    ("rate_limited", ("too many requests", "429")),
+    ("blocked", ("ip", "request", "blocked", "requestblocked", "ipblocked")),
+)
+
+# One anchored match: every branch is a lookahead over the whole message, so
+# the first branch that succeeds is the highest-priority category present
+_ERR_CATEGORIZER = re.compile(
+    '|'.join(
+        f"(?=.*?(?:{'|'.join(map(re.escape, keywords))}))(?P<{category}>)"
+        for category, keywords in _ERR_CATEGORIES
+    ),
+    re.S,
+)
+
+_ERR_MESSAGES = {
+    "no_captions": (
+        "⚠️ This video has no captions available.\n\n"
+        "YouTube requires a video to have either auto-generated or manual captions "
+        "for transcript extraction to work.\n\n"
+        "✅ Try videos from these types of channels — they almost always have captions:\n"
+        "• Tech tutorials (e.g. Fireship, Traversy Media, NetworkChuck)\n"
+        "• Educational (e.g. Khan Academy, Kurzgesagt, TED)\n"
+        "• Business/AI (e.g. Y Combinator, Lex Fridman, MKBHD)\n\n"
+        "💡 Tip: Open the video on YouTube → click CC button. "
+        "If it's greyed out, the video has no captions."
+    ),
+    "disabled": (
+        "⚠️ The video owner has disabled captions for this video.\n\n"
+        "Please try a different video. Most educational and tech videos have captions enabled."
+    ),
+    "unavailable": (
+        "⚠️ This video is private or unavailable.\n\n"
+        "Please check the URL and make sure the video is publicly accessible."
+    ),
+    "rate_limited": (
+        "⚠️ YouTube is rate-limiting requests. "
+        "Please wait 30–60 seconds and try again."
+    ),
+    "blocked": (
+        "YouTube is blocking transcript requests from this server's IP address.\n\n"
+        "This is a known limitation with ALL cloud platforms — Streamlit Cloud, AWS, GCP, Azure. "
+        "YouTube blocks their entire IP ranges at the network level.\n\n"
+        "Fix 1 — Run locally (free, works immediately):\n"
+        "  streamlit run app.py on your own machine bypasses this entirely.\n\n"
+        "Fix 2 — Add a Webshare residential proxy (for cloud deployment):\n"
+        "  1. Sign up at webshare.io and purchase a Residential proxy plan (~$3/mo)\n"
+        "  2. Add to .streamlit/secrets.toml:\n"
+        "     WEBSHARE_USERNAME = \'your-username\'\n"
+        "     WEBSHARE_PASSWORD = \'your-password\'\n"
+        "  3. Redeploy — DocMind detects the credentials and routes all transcript "
+        "requests through Webshare automatically."
+    ),
+}
 
 
 def _transcript_error(err: str) -> Tuple[bool, str, str, str]:
     """Convert raw exception message to a user-friendly error with actionable advice."""
-    e = err.lower()
-
-    if any(k in e for k in [
-        "no transcript", "could not retrieve", "notranscript",
-        "no captions", "subtitles are disabled", "transcript list",
-        "no element", "could not find"
-    ]):
-        msg = (
-            "⚠️ This video has no captions available.\n\n"
-            "YouTube requires a video to have either auto-generated or manual captions "
-            "for transcript extraction to work.\n\n"
-            "✅ Try videos from these types of channels — they almost always have captions:\n"
-            "• Tech tutorials (e.g. Fireship, Traversy Media, NetworkChuck)\n"
-            "• Educational (e.g. Khan Academy, Kurzgesagt, TED)\n"
-            "• Business/AI (e.g. Y Combinator, Lex Fridman, MKBHD)\n\n"
-            "💡 Tip: Open the video on YouTube → click CC button. "
-            "If it's greyed out, the video has no captions."
-        )
-    elif "disabled" in e or "transcriptsdisabled" in e:
-        msg = (
-            "⚠️ The video owner has disabled captions for this video.\n\n"
-            "Please try a different video. Most educational and tech videos have captions enabled."
-        )
-    elif any(k in e for k in ["unavailable", "private", "not available", "video unavailable"]):
-        msg = (
-            "⚠️ This video is private or unavailable.\n\n"
-            "Please check the URL and make sure the video is publicly accessible."
-        )
-    elif "too many requests" in e or "429" in err:
-        msg = (
-            "⚠️ YouTube is rate-limiting requests. "
-            "Please wait 30–60 seconds and try again."
-        )
-    elif any(k in e for k in ["ip", "request", "blocked", "requestblocked", "ipblocked"]):
-        msg = (
-            "YouTube is blocking transcript requests from this server's IP address.\n\n"
-            "This is a known limitation with ALL cloud platforms — Streamlit Cloud, AWS, GCP, Azure. "
-            "YouTube blocks their entire IP ranges at the network level.\n\n"
-            "Fix 1 — Run locally (free, works immediately):\n"
-            "  streamlit run app.py on your own machine bypasses this entirely.\n\n"
-            "Fix 2 — Add a Webshare residential proxy (for cloud deployment):\n"
-            "  1. Sign up at webshare.io and purchase a Residential proxy plan (~$3/mo)\n"
-            "  2. Add to .streamlit/secrets.toml:\n"
-            "     WEBSHARE_USERNAME = \'your-username\'\n"
-            "     WEBSHARE_PASSWORD = \'your-password\'\n"
-            "  3. Redeploy — DocMind detects the credentials and routes all transcript "
-            "requests through Webshare automatically."
-        )
+    match = _ERR_CATEGORIZER.match(err.lower())
+    if match:
+        msg = _ERR_MESSAGES[match.lastgroup]
     else:
         msg = (
             f"⚠️ Could not fetch transcript.\n\n"
@@ -276,52 +488,105 @@ def _transcript_error(err: str) -> Tuple[bool, str, str, str]:
 
 # ── Text helpers ─────────────────────────────────────────────────────────────
 
+_WORD_RE = re.compile(r'\S+')
+
+
 def chunk_transcript(raw_transcript: str, max_words: int = 7000) -> str:
-    words = raw_transcript.split()
-    if len(words) <= max_words:
+    # n words take at least 2n - 1 characters, so anything shorter than this
+    # can't exceed max_words and needs no scan at all
+    if len(raw_transcript) < 2 * max_words:
+        return raw_transcript
+    # Word start offsets let us slice the beginning / middle / end straight
+    # out of the source string instead of re-joining word lists. A typed
+    # array keeps them as machine ints rather than one int object per word.
+    starts = array('q', (m.start() for m in _WORD_RE.finditer(raw_transcript)))
+    if len(starts) <= max_words:
         return raw_transcript
     chunk = max_words // 3
-    beg = ' '.join(words[:chunk])
-    mid_s = len(words) // 2 - chunk // 2
-    mid = ' '.join(words[mid_s:mid_s + chunk])
-    end = ' '.join(words[-chunk:])
-    return f"{beg}\n\n[...middle summarized...]\n\n{mid}\n\n[...end summarized...]\n\n{end}"
-
-
-def parse_blog_metadata(blog_content: str) -> dict:
+    mid = len(starts) // 2 - chunk // 2
+    b_end, m_start, m_end, e_start = starts[chunk], starts[mid], starts[mid + chunk], starts[-chunk]
+    return (
+        f"{raw_transcript[:b_end].rstrip()}\n\n[...middle summarized...]\n\n"
+        f"{raw_transcript[m_start:m_end].rstrip()}\n\n[...end summarized...]\n\n"
+        f"{raw_transcript[e_start:].rstrip()}"
+    )
+
+
+_COMMA_RE = re.compile(r'\s*,\s*')
+
+
+def _split_keywords(val: str) -> list:
+    return [k for k in _COMMA_RE.split(val.strip()) if k]
+
+
+# Metadata label → (field, value parser), in priority order
+_META_FIELDS = {
+    'seo title': ('seo_title', str),
+    'meta description': ('meta_description', str),
+    'primary keyword': ('primary_keyword', str),
+    'secondary keyword': ('secondary_keywords', _split_keywords),
+}
+_META_LABELS = '|'.join(_META_FIELDS)
+# A metadata line: one lookahead branch per label, tried in priority order, so
+# a line mentioning several labels goes to the highest-priority field (the
+# branch's empty named group is the only field group that participates); the
+# value is everything after the line's first colon
+_META_VALUE_RE = re.compile(
+    '^(?:' + '|'.join(
+        f'(?=.*?{re.escape(label)})(?P<{field}>)'
+        for label, (field, _) in _META_FIELDS.items()
+    ) + r')[^:\n]*:(?P<value>.*)$',
+    re.I | re.M,
+)
+_META_PARSERS = dict(_META_FIELDS.values())
+# Any line mentioning a label, newline included, is dropped from the body
+_META_LINE_RE = re.compile(rf'^.*?(?:{_META_LABELS}).*(?:\n|\Z)', re.I | re.M)
+
+
+def parse_and_clean_blog(blog_content: str) -> Tuple[dict, str]:
+    """
+    Pull the SEO metadata lines out into a dict and return the remaining body,
+    each with one regex pass over the whole blog. Returns (metadata, cleaned_body).
+    """
     meta = {
         "seo_title": "", "meta_description": "",
         "primary_keyword": "", "secondary_keywords": []
     }
-    for line in blog_content.split('\n'):
-        ll = line.lower()
-        if ':' not in line:
-            continue
-        val = re.sub(r'\*+', '', line.split(':', 1)[-1]).strip()
-        if not val:
-            continue
-        if 'seo title' in ll:
-            meta["seo_title"] = val
-        elif 'meta description' in ll:
-            meta["meta_description"] = val
-        elif 'primary keyword' in ll:
-            meta["primary_keyword"] = val
-        elif 'secondary keyword' in ll:
-            meta["secondary_keywords"] = [k.strip() for k in val.split(',') if k.strip()]
-    return meta
+    for match in _META_VALUE_RE.finditer(blog_content):
+        val = match['value'].replace('*', '').strip()
+        if val:
+            field = next(f for f in _META_PARSERS if match[f] is not None)
+            meta[field] = _META_PARSERS[field](val)
+    return meta, _META_LINE_RE.sub('', blog_content).strip()
+
+
+def parse_blog_metadata(blog_content: str) -> dict:
+    return parse_and_clean_blog(blog_content)[0]
 
 
+@lru_cache(maxsize=8)
 def clean_blog_for_display(blog_content: str) -> str:
-    skip = ['seo title', 'meta description', 'primary keyword', 'secondary keyword']
-    return '\n'.join(
-        l for l in blog_content.split('\n')
-        if not any(k in l.lower() for k in skip)
-    ).strip()
+    return parse_and_clean_blog(blog_content)[1]
+
+
+_MARKDOWN_PUNCT = str.maketrans('', '', '#*`[]()>~_')
 
 
 def count_words(text: str) -> int:
-    return len(re.sub(r'[#*`\[\]()>~_]', '', text).split())
+    return len(text.translate(_MARKDOWN_PUNCT).split())
+
+
+_WORD_COUNT_LABELS = {n: f"{n} words" for n in range(100)}
 
 
 def format_word_count(count: int) -> str:
-    return f"{count / 1000:.1f}k words" if count >= 1000 else f"{count} words"
+    label = _WORD_COUNT_LABELS.get(count)
+    if label is not None:
+        return label
+    if count < 1000:
+        return f"{count} words"
+    if count % 100 == 50:
+        # exact ties: keep the float formatting's (representation-dependent) rounding
+        return f"{count / 1000:.1f}k words"
+    k, tenths = divmod((count + 50) // 100, 10)    # one decimal, rounded
+    return f"{k}.{tenths}k words"